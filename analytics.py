@@ -0,0 +1,270 @@
+import argparse
+from datetime import date
+import numpy as np
+from tracker_engine import flatten_sets, flatten_workouts
+from dates import format_date
+from events import ExerciseAdded, BlockCreated, TemplateAdded, WorkoutLogged
+
+
+PERIODS = ("day", "week", "month", "block", "template")
+METRICS = ("e1rm", "weight", "volume")
+UNIX_EPOCH = date(1970, 1, 1).toordinal()
+
+
+def group_sum(keys, values):
+    """Sums values by key, returns (the unique keys sorted, the sum of each)."""
+    unique, inverse = np.unique(keys, return_inverse=True)
+    return unique, np.bincount(inverse, weights=values, minlength=len(unique))
+
+
+def group_max(keys, values):
+    """The biggest value of each key, returns (the unique keys sorted, the max of each)."""
+    order = np.lexsort((values, keys))  # by key, then the biggest value of each key last
+    keys, values = keys[order], values[order]
+    if not len(keys):
+        return keys, values
+    last = np.flatnonzero(np.append(keys[1:] != keys[:-1], True))
+    return keys[last], values[last]
+
+
+def add_per_set_columns(cols):
+    """Adds the day, volume and estimated 1RM of each set to flattened sets."""
+    cols["day"] = cols["days"][cols["workout"]]
+    # counted the same way as the tracker, int(weight) * int(reps)
+    cols["volume"] = np.trunc(cols["weight"]) * np.trunc(cols["reps"])
+    # rep_max.estimated_1rm() for every set at once
+    cols["e1rm"] = np.where(cols["reps"] > 1, cols["weight"] * (1 + cols["reps"] / 30), cols["weight"])
+    cols["e1rm"][cols["reps"] <= 0] = 0.0
+    return cols
+
+
+def rolling_mean(values, window):
+    """The mean of each value and the window - 1 values before it (fewer at the start)."""
+    values = np.asarray(values, dtype=np.float64)
+    sums = np.concatenate(([0.0], np.cumsum(values)))
+    ends = np.arange(1, len(values) + 1)
+    starts = np.maximum(ends - window, 0)
+    return (sums[ends] - sums[starts]) / (ends - starts)
+
+
+
+class Analytics():
+    """Questions about the whole training history answered with numpy instead of loops over the workouts.
+
+    Every set is flattened into columns once (see tracker_engine.flatten_sets), and the answers are
+    kept until the manager's data_version changes, so asking again is free until a workout, block or
+    exercise is added or removed. Workouts logged after that are added on to the columns from the
+    manager's events instead of flattening everything again. The arrays that come back are shared
+    with the cache, don't change them."""
+
+    def __init__(self, manager):
+        self.manager = manager
+        self.version = None
+        self.cols = None
+        self.results = {}
+        manager.events.subscribe(self.data_changed, batched=True)
+
+
+    def data_changed(self, events):
+        """Adds the sets of newly logged workouts to the columns. Only when nothing else happened since they
+        were made (each change is one event and one data_version), anything else leaves them to be made again."""
+        if self.cols is None or self.version + len(events) != self.manager.data_version:
+            return
+        if not all(isinstance(event, (WorkoutLogged, ExerciseAdded, BlockCreated, TemplateAdded)) for event in events):
+            return
+
+        new = flatten_workouts((event.block_index, event.workout) for event in events if isinstance(event, WorkoutLogged))
+        if len(new["days"]):
+            cols = self.cols
+            add_per_set_columns(new)
+            new["workout"] += len(cols["days"])  # numbered after the workouts already there
+            for name, column in new.items():
+                if name == "templates":
+                    cols[name] = cols[name] + column
+                elif name == "exercises":
+                    cols[name] = column  # every exercise name so far
+                else:
+                    cols[name] = np.concatenate((cols[name], column))
+            self.results = {}
+        self.version = self.manager.data_version
+
+
+    def columns(self):
+        """The flattened sets, made again only when the data has changed since the last time."""
+        if self.version != self.manager.data_version:
+            # the lazy storages only read the workouts that were looked at
+            self.manager.storage.load_everything(self.manager)
+            self.cols = add_per_set_columns(flatten_sets(self.manager.training_blocks))
+            self.results = {}
+            self.version = self.manager.data_version
+        return self.cols
+
+
+    def cached(self, key, compute):
+        cols = self.columns()  # clears the old results if the data changed
+        if key not in self.results:
+            self.results[key] = compute(cols)
+        return self.results[key]
+
+
+    def exercise_mask(self, cols, exercise):
+        if exercise is None:
+            return np.ones(len(cols["exercise"]), dtype=bool)
+        if exercise not in cols["exercises"]:
+            return np.zeros(len(cols["exercise"]), dtype=bool)
+        return cols["exercise"] == cols["exercises"].index(exercise)
+
+
+    def period_keys(self, cols, period):
+        """The group of each set for a period in PERIODS. Days, weeks and months are day numbers
+        (the first day of the week or month), blocks are indexes into training_blocks and templates are names."""
+        day = cols["day"]
+        if period == "day":
+            return day
+        if period == "week":
+            return day - (day - 1) % 7  # day 1 was a Monday
+        if period == "month":
+            months = (day - UNIX_EPOCH).astype("datetime64[D]").astype("datetime64[M]")
+            return months.astype("datetime64[D]").astype(np.int64) + UNIX_EPOCH
+        if period == "block":
+            return cols["blocks"][cols["workout"]]
+        if period == "template":
+            return np.array(cols["templates"], dtype=object)[cols["workout"]].astype(str)
+        raise ValueError(f"period has to be one of {', '.join(PERIODS)}, not {period!r}")
+
+
+    def volume_by(self, period="week", exercise=None):
+        """Total volume grouped by period (see period_keys), of one exercise or of everything.
+        Returns (keys, volumes), sorted by key."""
+
+        def compute(cols):
+            mask = self.exercise_mask(cols, exercise)
+            return group_sum(self.period_keys(cols, period)[mask], cols["volume"][mask])
+        return self.cached(("volume", period, exercise), compute)
+
+
+    def sets_by(self, period="week", exercise=None):
+        """Number of sets grouped by period, returns (keys, counts)."""
+
+        def compute(cols):
+            mask = self.exercise_mask(cols, exercise)
+            keys, counts = group_sum(self.period_keys(cols, period)[mask], np.ones(np.count_nonzero(mask)))
+            return keys, counts.astype(np.int64)
+        return self.cached(("sets", period, exercise), compute)
+
+
+    def rolling_volume(self, window=4, period="week", exercise=None):
+        """The rolling average of volume_by() over window periods, returns (keys, averages).
+        Weeks or months with no workouts count as 0 so a break pulls the average down."""
+
+        def compute(cols):
+            keys, volumes = self.volume_by(period, exercise)
+            if period in ("week", "month") and len(keys):
+                # fill in the empty periods between the first and last one
+                if period == "week":
+                    every = np.arange(keys[0], keys[-1] + 1, 7)
+                else:
+                    first, last = (np.array(keys[[0, -1]] - UNIX_EPOCH).astype("datetime64[D]").astype("datetime64[M]"))
+                    every = np.arange(first, last + 1).astype("datetime64[D]").astype(np.int64) + UNIX_EPOCH
+                filled = np.zeros(len(every))
+                filled[np.searchsorted(every, keys)] = volumes
+                keys, volumes = every, filled
+            return keys, rolling_mean(volumes, window)
+        return self.cached(("rolling", window, period, exercise), compute)
+
+
+    def workout_values(self, exercise, metric="e1rm", reps=None):
+        """One point per workout an exercise was done in, returns (days, values).
+
+        metric is "e1rm" (the best estimated 1RM of the workout), "weight" (the heaviest weight,
+        only counting sets of exactly reps if given) or "volume" (the workout's total)."""
+        if metric not in METRICS:
+            raise ValueError(f"metric has to be one of {', '.join(METRICS)}, not {metric!r}")
+
+        def compute(cols):
+            mask = self.exercise_mask(cols, exercise)
+            if reps is not None:
+                mask &= cols["reps"] == reps
+            workouts, values = cols["workout"][mask], cols[metric][mask]
+            if metric == "volume":
+                workouts, values = group_sum(workouts, values)
+            else:
+                workouts, values = group_max(workouts, values)
+            days = cols["days"][workouts]
+            order = np.argsort(days, kind="stable")
+            return days[order], values[order]
+        return self.cached(("workouts", exercise, metric, reps), compute)
+
+
+    def trend(self, exercise, metric="e1rm", reps=None):
+        """A straight line fit through workout_values() with np.polyfit. Returns None with fewer than
+        two different days, otherwise a dict with the change per week, the fitted value at the first
+        and last day, r squared and the number of workouts."""
+
+        def compute(cols):
+            days, values = self.workout_values(exercise, metric, reps)
+            if len(np.unique(days)) < 2:
+                return None
+            x = (days - days[0]).astype(np.float64)
+            slope, intercept = np.polyfit(x, values, 1)
+            fitted = slope * x + intercept
+            total = np.sum((values - values.mean()) ** 2)
+            r2 = 1 - np.sum((values - fitted) ** 2) / total if total else 1.0
+            return {"per_week": slope * 7, "start": fitted[0], "end": fitted[-1], "r2": r2, "workouts": len(days),
+                    "first_day": int(days[0]), "last_day": int(days[-1])}
+        return self.cached(("trend", exercise, metric, reps), compute)
+
+
+    def trends(self, metric="e1rm"):
+        """The trend() of every exercise that has at least two workouts on different days, {exercise: trend}."""
+
+        def compute(cols):
+            done = np.unique(cols["exercise"])
+            result = {}
+            for exercise_id in done:
+                name = cols["exercises"][exercise_id]
+                fit = self.trend(name, metric)
+                if fit is not None:
+                    result[name] = fit
+            return result
+        return self.cached(("trends", metric), compute)
+
+
+    def label(self, period, key):
+        """A key from volume_by() and friends as text."""
+        if period in ("day", "week", "month"):
+            return format_date(int(key))
+        if period == "block":
+            return self.manager.training_blocks[int(key)].starting_date
+        return str(key)
+
+
+
+if __name__ == "__main__":
+    from workout_manager import WorkoutManager
+
+    parser = argparse.ArgumentParser(description="Print volume and progress summaries of the whole training history.")
+    parser.add_argument("--by", choices=PERIODS, default="week", help="what to group the volume by (default: week)")
+    parser.add_argument("--exercise", help="only this exercise (default: every exercise)")
+    parser.add_argument("--window", type=int, default=4, help="periods in the rolling average (default: 4)")
+    parser.add_argument("--metric", choices=METRICS, default="e1rm", help="what the trends follow (default: e1rm)")
+    args = parser.parse_args()
+
+    manager = WorkoutManager()
+    analytics = Analytics(manager)
+
+    keys, volumes = analytics.volume_by(args.by, args.exercise)
+    rolling = dict(zip(*analytics.rolling_volume(args.window, args.by, args.exercise))) if args.by in ("day", "week", "month") else {}
+    print(f"Volume by {args.by}:")
+    for key, volume in zip(keys, volumes):
+        average = f"   (rolling {rolling[key]:.0f})" if key in rolling else ""
+        print(f"  {analytics.label(args.by, key)}: {volume:.0f}{average}")
+
+    print(f"\nTrends ({args.metric} per week):")
+    trends = {args.exercise: analytics.trend(args.exercise, args.metric)} if args.exercise else analytics.trends(args.metric)
+    for name, fit in trends.items():
+        if fit is None:
+            print(f"  {name}: not enough workouts")
+        else:
+            print(f"  {name}: {fit['per_week']:+.1f} ({fit['start']:.0f} -> {fit['end']:.0f}, r2 {fit['r2']:.2f}, {fit['workouts']} workouts)")
+    manager.close()
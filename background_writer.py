@@ -0,0 +1,91 @@
+import atexit
+import os
+import threading
+
+
+def write_text_atomic(path, text):
+    """Writes the text to a temp file next to path and renames it over path,
+    so a crash mid-write never leaves a half written file behind."""
+    temp_path = path + ".tmp"
+    with open(temp_path, "w") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+
+class BackgroundWriter():
+    """Writes files on a background thread so saving never makes the window wait on the disk.
+
+    write(path, make_text) queues a file to be written. make_text is called on the writer thread,
+    so it should only use data that won't change afterwards (a snapshot). Writes are held for
+    DELAY seconds and if the same file is written again in the meantime only the newest text is
+    written, so a burst of changes costs one write per file instead of one per change.
+
+    flush() waits until everything queued is on disk. It is called by close() and also when the
+    program exits, so nothing queued is lost. If a file couldn't be written, flush() raises the
+    error (the first one since the last flush()) so it doesn't go unnoticed."""
+
+    DELAY = 0.25  # seconds to wait for more changes before writing
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.pending = {}      # {path: (make_text, done)} waiting to be written
+        self.error = None      # the first write that failed since the last flush()
+        self.writing = False   # the thread is writing a batch right now
+        self.thread = None     # started on the first write
+        atexit.register(self.flush)
+
+
+    def write(self, path, make_text, done=None):
+        """Queues the file. done (if given) is called on the writer thread once this text of it is on disk."""
+        with self.condition:
+            idle = not self.pending
+            self.pending[path] = (make_text, done)  # replaces an older text for the same file that wasn't written yet
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name="writer", daemon=True)
+                self.thread.start()
+            # only wake the thread for the first change, waking it during the delay would write too early
+            if idle:
+                self.condition.notify_all()
+
+
+    def run(self):
+        while True:
+            with self.condition:
+                while not self.pending:
+                    self.condition.wait()
+                # give a burst of changes a moment to finish, flush() cuts this short
+                self.condition.wait(self.DELAY)
+                batch, self.pending = self.pending, {}
+                self.writing = True
+
+            for path, (make_text, done) in batch.items():
+                try:
+                    write_text_atomic(path, make_text())
+                    if done is not None:
+                        done()
+                except Exception as e:
+                    print(f"Could not save {path}: {e}")
+                    with self.condition:
+                        self.error = self.error or e
+
+            with self.condition:
+                self.writing = False
+                self.condition.notify_all()
+
+
+    def flush(self):
+        """Waits until everything queued so far has been written, raises the error if a write failed."""
+        with self.condition:
+            while self.pending or self.writing:
+                self.condition.notify_all()  # wakes the thread early if it's waiting out the delay
+                self.condition.wait(0.05)
+            error, self.error = self.error, None
+        if error is not None:
+            raise error
+
+
+    def close(self):
+        self.flush()
@@ -0,0 +1,283 @@
+"""Measures how long the app takes to start, and how that grows with the size of the workout history.
+
+Every measurement runs in a fresh Python process with its home folder (HOME, and USERPROFILE,
+APPDATA and LOCALAPPDATA on Windows) pointed at a temporary folder, so nothing is cached between
+runs and your own data is never touched. It measures:
+
+    imports      the import time of each of the app's modules on its own
+    load         WorkoutManager() with each storage, and then reading every workout
+    home_screen  WorkoutAppGUI() until the home screen has been drawn, under Xvfb if there's no display
+
+for synthetic histories of increasing size, and prints the results as JSON (or writes them to
+--output) so runs of different versions can be compared.
+
+Run it from anywhere:
+    python benchmarks/startup.py --sizes 0 1000 10000 --output results.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = ["dates", "exercise_catalog", "exercise_index", "background_writer", "snapshot_cache", "events", "workout", "workout_templates", "training_block", "tracker_series",
+           "storage", "workout_manager", "tracker_engine", "analytics", "downsample", "image_pyramid", "chart_renderer", "workoutapp_gui", "workout_app"]
+STORAGES = ["json", "journal", "sqlite"]
+CACHED_STORAGES = ["json", "journal"]
+
+EXERCISES = ["Bench Press", "Squat", "Deadlift", "Overhead Press", "Barbell Row", "Pull Up", "Dip", "Lunge",
+             "Leg Press", "Curl", "Tricep Extension", "Lateral Raise", "Calf Raise", "Face Pull", "Hip Thrust"]
+WORKOUTS_PER_BLOCK = 48  # 4 a week for 12 weeks
+EXERCISES_PER_WORKOUT = 5
+SETS_PER_EXERCISE = 4
+
+
+
+def run_child(mode, home, env=None, *args):
+    """Runs this script again in a fresh process to measure one thing, and returns what it reports (and the wall time)."""
+
+    # the app keeps its data in ~/.local/share, ~/Library/Application Support or %APPDATA% (see
+    # get_user_data_path()), so every variable those come from has to point at the temporary folder
+    child_env = dict(env or os.environ, HOME=home, USERPROFILE=home, APPDATA=home, LOCALAPPDATA=home)
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", mode, *args],
+                            cwd=REPO_DIR, env=child_env, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+
+    if result.returncode != 0:
+        raise RuntimeError(f"'{mode}' benchmark failed:\n{result.stderr}")
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    report["wall"] = wall
+    return report
+
+
+def summarize(runs):
+    """Combines repeated runs into the median and the fastest of every timing."""
+    summary = {}
+    for key in runs[0]:
+        values = [run[key] for run in runs]
+        if all(isinstance(value, float) for value in values):
+            summary[key] = {"median": statistics.median(values), "min": min(values)}
+        else:
+            summary[key] = values[0]
+    return summary
+
+
+def start_virtual_display():
+    """Returns (environment, Xvfb process) to run the GUI in, or (None, reason) if there is no way to show a window."""
+
+    if os.environ.get("DISPLAY"):
+        return dict(os.environ), None
+    if shutil.which("Xvfb") is None:
+        return None, "no display and Xvfb is not installed"
+
+    for number in range(99, 120):
+        if not os.path.exists(f"/tmp/.X11-unix/X{number}"):
+            break
+    process = subprocess.Popen(["Xvfb", f":{number}", "-screen", "0", "1280x800x24", "-nolisten", "tcp"],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    # wait for the server to be ready to take connections
+    for _ in range(100):
+        if os.path.exists(f"/tmp/.X11-unix/X{number}") or process.poll() is not None:
+            break
+        time.sleep(0.05)
+    if process.poll() is not None:
+        return None, "Xvfb failed to start"
+
+    return dict(os.environ, DISPLAY=f":{number}"), process
+
+
+
+def benchmark(sizes, repeat):
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "commit": git_commit(),
+        "repeat": repeat,
+        "imports": {},
+        "load": [],
+        "home_screen": [],
+    }
+
+    with tempfile.TemporaryDirectory() as home:
+        for module in MODULES:
+            results["imports"][module] = summarize([run_child("imports", home, None, module) for _ in range(repeat)])
+
+    display_env, display = start_virtual_display()
+    if display_env is None:
+        results["home_screen"] = {"skipped": display}
+
+    try:
+        for size in sizes:
+            # each size gets its own data folder, generated once and then only read
+            with tempfile.TemporaryDirectory() as home:
+                dataset = run_child("generate", home, None, str(size))
+
+                for storage in STORAGES:
+                    # the JSON storages keep a pickle cache of the files they read (see snapshot_cache.py),
+                    # "cold" is the first start after the files changed and "warm" every one after that
+                    for cache in (("cold", "warm") if storage in CACHED_STORAGES else ("warm",)):
+                        runs = [run_child("load", home, None, storage, cache) for _ in range(repeat)]
+                        results["load"].append(dict(dataset, storage=storage, cache=cache, **summarize(runs)))
+
+                if display_env is not None:
+                    runs = [run_child("home", home, display_env) for _ in range(repeat)]
+                    results["home_screen"].append(dict(dataset, **summarize(runs)))
+    finally:
+        if display is not None and display_env is not None:
+            display.terminate()
+            display.wait()
+
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR, capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+
+#############################################################################################################
+
+########### Everything below runs in the child processes
+
+#############################################################################################################
+
+
+
+def child_imports(module):
+    start = time.perf_counter()
+    __import__(module)
+    return {"import": time.perf_counter() - start}
+
+
+def child_generate(size):
+    """Writes a history of size workouts to every storage (the home folder is a temporary one here, see run_child())."""
+    from workout_manager import WorkoutManager
+    from training_block import TrainingBlock
+    from workout import Workout
+    from storage import SqliteStorage
+    from datetime import date, timedelta
+
+    rng = random.Random(size)  # the same size always gives the same data
+    manager = WorkoutManager(storage="json")
+    manager.all_exercises = sorted(EXERCISES)
+
+    day = date(2015, 1, 5)
+    block = None
+    sets = 0
+    for i in range(size):
+        if i % WORKOUTS_PER_BLOCK == 0:
+            block = TrainingBlock(day.strftime("%m-%d-%Y"), "4")
+            templates = [rng.sample(EXERCISES, EXERCISES_PER_WORKOUT) for _ in range(4)]
+            for n, exercises in enumerate(templates):
+                block.add_template(f"Day {n + 1}", exercises)
+            manager.training_blocks.append(block)
+
+        template = block.templates[i % 4]
+        workout = Workout(template.name, day.strftime("%B %d, %Y"))
+        entries = {}
+        for exercise in template.exercises:
+            base = 45 + 5 * rng.randrange(40) + i // 20
+            entries[exercise] = [[rng.choice((3, 5, 8, 10, 12)), base + 5 * rng.randrange(4)] for _ in range(SETS_PER_EXERCISE)]
+            sets += SETS_PER_EXERCISE
+        workout.add_entry(entries)
+        block.add_workout(workout)
+
+        day += timedelta(days=2 if i % 4 == 3 else 1)
+
+    manager.rebuild_tracker()  # also saves the tracker
+    manager.storage.save_all(manager)
+
+    sqlite = SqliteStorage(manager.SQLITE_FILE)
+    sqlite.save_all(manager)
+    sqlite.close()
+    manager.close()  # the JSON files are written in the background
+
+    return {"workouts": size, "blocks": len(manager.training_blocks), "sets": sets,
+            "json_bytes": os.path.getsize(manager.DATA_FILE) + os.path.getsize(manager.TOTAL_DATA_FILE),
+            "sqlite_bytes": os.path.getsize(manager.SQLITE_FILE)}
+
+
+def child_load(storage, cache="warm"):
+    start = time.perf_counter()
+    from workout_manager import WorkoutManager
+    from snapshot_cache import cache_path
+    imported = time.perf_counter()
+
+    # a warm start uses the cache the cold runs before it left behind
+    if cache == "cold":
+        for path in (WorkoutManager.DATA_FILE, WorkoutManager.TOTAL_DATA_FILE):
+            if os.path.exists(cache_path(path)):
+                os.remove(cache_path(path))
+
+    manager = WorkoutManager(storage=storage)
+    constructed = time.perf_counter()
+
+    # the lazy storages only read workouts when they're needed, this is what reading all of them costs
+    manager.storage.load_everything(manager)
+    for block in manager.training_blocks:
+        block.workouts
+    loaded = time.perf_counter()
+    manager.close()
+
+    return {"import": imported - start, "construct": constructed - imported, "load_everything": loaded - constructed}
+
+
+def child_home():
+    start = time.perf_counter()
+    from workout_manager import WorkoutManager
+    from workoutapp_gui import WorkoutAppGUI
+    imported = time.perf_counter()
+
+    manager = WorkoutManager()
+    constructed = time.perf_counter()
+
+    app = WorkoutAppGUI(manager)  # this shows the HomeScreen
+    created = time.perf_counter()
+    app.update()  # draws the window and runs what was left for when it's idle (the home picture)
+    drawn = time.perf_counter()
+
+    app.destroy()
+    manager.close()
+    return {"import": imported - start, "construct": constructed - imported, "create_window": created - constructed,
+            "first_draw": drawn - created, "total": drawn - start}
+
+
+CHILDREN = {"imports": child_imports, "generate": child_generate, "load": child_load, "home": child_home}
+
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark app startup and data loading on synthetic workout histories.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[0, 1000, 10000], help="numbers of workouts to generate (default: 0 1000 10000)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs of each measurement, the median and min are reported (default: 3)")
+    parser.add_argument("--output", help="file to write the JSON results to (default: print them)")
+    parser.add_argument("--child", nargs="+", help=argparse.SUPPRESS)  # used internally to run one measurement
+    args = parser.parse_args()
+
+    if args.child:
+        sys.path.insert(0, REPO_DIR)
+        mode, *child_args = args.child
+        child_args = [int(arg) if mode == "generate" else arg for arg in child_args]
+        print(json.dumps(CHILDREN[mode](*child_args)))
+    else:
+        results = json.dumps(benchmark(args.sizes, args.repeat), indent=4)
+        if args.output:
+            with open(args.output, "w") as f:
+                f.write(results + "\n")
+        else:
+            print(results)
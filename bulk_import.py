@@ -0,0 +1,169 @@
+import argparse
+import csv
+import json
+import os
+from workout import Workout
+from dates import parse_date, format_date
+
+
+# every row is one set, the rows of one workout have to be next to each other
+COLUMNS = ["block", "date", "template", "exercise", "set", "reps", "weight"]
+
+
+def read_rows(path, file_format=None):
+    """Yields (line number, row) for every row of a .csv or .jsonl file, reading it as it goes.
+    A row is a dict, or for .jsonl the line's text: it's parsed by parse_row() so a broken line
+    is skipped like any other bad row instead of stopping the import."""
+
+    file_format = file_format or ("jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv")
+
+    with open(path, "r", newline="") as f:
+        if file_format == "csv":
+            # line 1 is the header
+            for line_number, row in enumerate(csv.DictReader(f), start=2):
+                yield line_number, row
+        else:
+            for line_number, line in enumerate(f, start=1):
+                if line.strip():
+                    yield line_number, line
+
+
+def parse_row(row):
+    """Checks a row and returns (workout key, exercise, set number, reps, weight)."""
+
+    if isinstance(row, str):
+        row = json.loads(row)  # a JSONDecodeError is a ValueError too
+        if not isinstance(row, dict):
+            raise ValueError("not a JSON object")
+
+    missing = [column for column in ("block", "date", "template", "exercise", "reps", "weight") if row.get(column) in (None, "")]
+    if missing:
+        raise ValueError(f"missing {', '.join(missing)}")
+
+    workout_date = format_date(parse_date(str(row["date"]).strip()))  # saved the same way the app saves dates
+    key = (str(row["block"]).strip(), workout_date, str(row["template"]).strip())
+    set_number = int(row["set"]) if row.get("set") not in (None, "") else None
+    return key, str(row["exercise"]).strip(), set_number, int(float(row["reps"])), float(row["weight"])
+
+
+def group_workouts(rows):
+    """Turns the stream of set rows into a stream of (block starting date, Workout), one workout at a time.
+    Rows that can't be read are skipped with a message."""
+
+    key, sets = None, {}
+    skipped = 0
+
+    def finish():
+        workout = Workout(key[2], key[1])
+        # the sets in the order of their set number, or of the rows if there isn't one
+        workout.add_entry({exercise: [[reps, weight] for _, _, reps, weight in sorted(exercise_sets, key=lambda s: s[:2])]
+                           for exercise, exercise_sets in sets.items()})
+        return key[0], workout
+
+    for line_number, row in rows:
+        try:
+            row_key, exercise, set_number, reps, weight = parse_row(row)
+        except (ValueError, TypeError) as e:
+            print(f"Skipping line {line_number}: {e}")
+            skipped += 1
+            continue
+
+        if row_key != key:
+            if key is not None:
+                yield finish()
+            key, sets = row_key, {}
+        exercise_sets = sets.setdefault(exercise, [])
+        exercise_sets.append((set_number if set_number is not None else len(exercise_sets) + 1, len(exercise_sets), reps, weight))
+
+    if key is not None:
+        yield finish()
+    if skipped:
+        print(f"{skipped} lines skipped.")
+
+
+def import_workouts(manager, workouts):
+    """Adds the (block starting date, Workout) pairs to the manager like the app would add them one
+    by one (so the tracker and its personal bests are kept up to date as they go), but only saves
+    once at the end, instead of once per workout.
+
+    Workouts go into the existing block with the same starting date, or a new block. Templates
+    and exercises the manager doesn't have yet are added too, an existing template is left as it
+    is. Returns how much was imported.
+
+    The manager's subscribers get an event for each of those, all together once everything is saved."""
+
+    with manager.events.batch():
+        return add_workouts(manager, workouts)
+
+
+def add_workouts(manager, workouts):
+    records = []  # every change made, they're all saved together at the end
+
+    def apply(record):
+        manager.events.publish(manager.apply(record))
+        records.append(record)
+
+    blocks = {block.starting_date: i for i, block in enumerate(manager.training_blocks)}
+    new_blocks = []  # (block index, its add_block record)
+    # the exercises of the templates that have to be added, {(block index, template name): [exercise, ...]}
+    new_templates = {}
+    counts = {"workouts": 0, "sets": 0, "blocks": 0, "exercises": 0}
+
+    for starting_date, workout in workouts:
+        index = blocks.get(starting_date)
+        if index is None:
+            index = blocks[starting_date] = len(manager.training_blocks)
+            record = {"op": "add_block", "starting_date": starting_date, "workouts_per_week": ""}
+            apply(record)
+            new_blocks.append((index, record))
+
+        entries = workout.entries
+        if not any(template.name == workout.template_name for template in manager.training_blocks[index].templates):
+            # a template gets every exercise done in any of its workouts, so it's only added at the end
+            exercises = new_templates.setdefault((index, workout.template_name), [])
+            exercises.extend(name for name in entries if name not in exercises)
+
+        for name in entries:
+            if name not in manager.all_exercises:
+                apply({"op": "add_exercise", "name": name})
+                counts["exercises"] += 1
+
+        apply({"op": "add_workout", "block": index, "workout": workout.to_dict()})
+        counts["workouts"] += 1
+        counts["sets"] += sum(len(sets) for sets in entries.values())
+
+    for (index, name), exercises in new_templates.items():
+        apply({"op": "add_template", "block": index, "name": name, "exercises": exercises})
+
+    # a new block does a week of each of its templates (nothing is saved yet, so the record can still change)
+    for index, record in new_blocks:
+        block = manager.training_blocks[index]
+        block.workouts_per_week = record["workouts_per_week"] = str(len(block.templates))
+    counts["blocks"] = len(new_blocks)
+
+    manager.storage.record_many(manager, records)
+    return counts
+
+
+def import_file(manager, path, file_format=None):
+    return import_workouts(manager, group_workouts(read_rows(path, file_format)))
+
+
+
+if __name__ == "__main__":
+    from workout_manager import WorkoutManager
+
+    parser = argparse.ArgumentParser(description=f"Import past workouts from a CSV or JSON lines file with the columns: {', '.join(COLUMNS)}. "
+                                                 "The workouts are added to the data in use like the app adds them, "
+                                                 "and everything is saved once at the end.")
+    parser.add_argument("file", help="the .csv or .jsonl file to import")
+    parser.add_argument("--format", choices=("csv", "jsonl"), help="the file's format (default: from the file extension)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.file):
+        parser.error(f"{args.file} not found")
+
+    manager = WorkoutManager()
+    counts = import_file(manager, args.file, args.format)
+    manager.close()
+    print(f"Imported {counts['workouts']} workouts ({counts['sets']} sets) into {counts['blocks']} new training blocks, {counts['exercises']} new exercises.")
@@ -0,0 +1,115 @@
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+import numpy as np
+import matplotlib.dates as mdates
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from PIL import Image
+
+
+# matplotlib counts dates as days since its own epoch, this turns the tracker's day numbers
+# (date.toordinal()) into those with one subtraction, so plotting never has to convert each date
+MPL_DAY_OFFSET = 1 - mdates.date2num(date.fromordinal(1))
+
+def plot_days(series):
+    return np.asarray(series.days) - MPL_DAY_OFFSET
+
+
+
+class ChartRenderer():
+    """Draws the charts of the stats screen into images on a background thread, so the window
+    doesn't freeze while a dozen graphs are drawn.
+
+    Each chart is drawn with matplotlib's Agg backend into one reused figure and comes back as a
+    PIL image for the Tk thread to show. matplotlib isn't thread safe, so there is only the one
+    drawing thread and nothing else in the app uses matplotlib while it runs. Tk itself must only
+    be touched from the Tk thread, so finished images wait in a queue until the screen collects
+    them with poll().
+    Starting a new render() makes everything from the previous one stale: charts that haven't
+    started are skipped and finished ones are thrown away by poll()."""
+
+    MARKER_LIMIT = 60
+
+    def __init__(self):
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chart")
+        self.slot = None  # the (fig, ax, line, canvas) every chart is drawn with, made for the first one
+        self.results = queue.SimpleQueue()  # (generation, request, index, image) ready for the Tk thread
+        self.generation = 0
+        self.futures = []
+
+
+    def render(self, request, charts):
+        """Starts drawing charts, a list of (index, chart). request identifies them when they come back from poll()."""
+
+        self.generation += 1
+        for future in self.futures:
+            future.cancel()
+
+        self.futures = [self.executor.submit(self.render_chart, self.generation, request, index, chart) for index, chart in charts]
+
+
+    def busy(self):
+        return any(not future.done() for future in self.futures)
+
+
+    def poll(self):
+        """Returns the (request, index, image) of every chart finished since the last poll,
+        leaving out those of a request that has since been replaced."""
+
+        done = []
+        while True:
+            try:
+                generation, request, index, image = self.results.get_nowait()
+            except queue.Empty:
+                return done
+            if generation == self.generation:
+                done.append((request, index, image))
+
+
+    def render_chart(self, generation, request, index, chart):
+        # runs on a worker thread
+        if generation != self.generation:
+            return  # the user already picked something else
+
+        if self.slot is None:
+            self.slot = self.new_figure()
+        image = self.draw(self.slot, chart)
+
+        self.results.put((generation, request, index, image))
+
+
+    def new_figure(self):
+        fig = Figure(figsize=(6, 4.1))
+        canvas = FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        line, = ax.plot([], [], marker='o')
+        ax.xaxis_date()  # the x values are matplotlib date numbers
+        ax.set_xlabel("Date")
+        ax.xaxis.set_major_locator(mdates.AutoDateLocator())
+        ax.grid(True)  # Add grid for better readability
+        return fig, ax, line, canvas
+
+
+    def draw(self, slot, chart):
+        fig, ax, line, canvas = slot
+
+        # only draw as many points as the chart is wide enough to show (chart["span"] None means every date)
+        x, y = chart["levels"].for_span(chart["span"], ax.get_window_extent().width)
+        line.set_data(x, y)
+        line.set_marker('o' if len(x) <= self.MARKER_LIMIT else '')  # markers just turn into a thick line past this
+        ax.set_title(chart["title"], fontsize=14)
+        ax.set_ylabel(chart["ylabel"])
+        # this formats the dates for the x-axis
+        ax.xaxis.set_major_formatter(mdates.DateFormatter(chart["date_format"]))
+        ax.relim()
+        ax.autoscale_view()
+        fig.autofmt_xdate()  # Auto-rotate date labels
+
+        canvas.draw()
+        # copy the pixels out, the figure's buffer gets reused for the next chart
+        return Image.fromarray(np.asarray(canvas.buffer_rgba())).copy()
+
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,42 @@
+from datetime import date, datetime
+from functools import lru_cache
+
+
+# this is the format workout dates are saved in, e.g. "June 23, 2025"
+DATE_FORMAT = "%B %d, %Y"
+# older or hand entered dates may be in one of these instead
+OTHER_FORMATS = ("%m-%d-%Y", "%Y-%m-%d")
+# the day a saved date that can't be read is put on (January 1 of year 1), it sorts before every real date
+UNKNOWN_DAY = 1
+
+
+@lru_cache(maxsize=None)
+def parse_date(text):
+    """Converts a workout date ("June 23, 2025", "06-23-2025" or "2025-06-23") to a day number (date.toordinal()).
+
+    Dates are turned into day numbers once, when they're loaded or entered, and everything after
+    that works with the numbers. The same few hundred dates repeat across every series of the
+    tracker, so the results are cached and each distinct date string is only parsed once."""
+    for date_format in (DATE_FORMAT,) + OTHER_FORMATS:
+        try:
+            return datetime.strptime(text, date_format).toordinal()
+        except ValueError:
+            pass
+    raise ValueError(f"Unrecognized date '{text}'.")
+
+
+@lru_cache(maxsize=None)
+def parse_saved_date(text):
+    """parse_date() for dates read back from the data files. A date in none of the formats (e.g.
+    edited by hand) shouldn't stop the app from starting, so it is reported once and UNKNOWN_DAY is
+    used for it instead. Dates the user is typing in should go through parse_date() to be checked."""
+    try:
+        return parse_date(text)
+    except ValueError:
+        print(f"Unrecognized date '{text}', it is treated as the earliest date.")
+        return UNKNOWN_DAY
+
+
+def format_date(day):
+    """Converts a day number back to the saved workout date format."""
+    return date.fromordinal(day).strftime(DATE_FORMAT)
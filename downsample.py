@@ -0,0 +1,98 @@
+import numpy as np
+
+
+def lttb(x, y, threshold):
+    """Largest-triangle-three-buckets: picks threshold points out of (x, y) that keep the shape of
+    the line, by keeping from each bucket of points the one making the biggest triangle with its
+    neighbours. x must be sorted."""
+
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return x, y
+
+    every = (n - 2) / (threshold - 2)  # points per bucket, the first and last point are always kept
+    keep = np.empty(threshold, dtype=np.int64)
+    keep[0] = 0
+    keep[-1] = n - 1
+
+    a = 0  # the point picked from the previous bucket
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+
+        # average of the next bucket is the third corner of the triangle
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        keep[i + 1] = a
+
+    return x[keep], y[keep]
+
+
+def aggregate(x, y, period, how):
+    """Combines the points of each week or month into one point placed at their average date.
+    x are matplotlib date numbers (days since 1970-01-01), how is "max" or "mean"."""
+
+    days = np.floor(x).astype(np.int64)
+    if period == "week":
+        groups = (days + 3) // 7  # 1970-01-01 was a Thursday, this makes weeks start on Monday
+    else:
+        groups = days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+
+    keys, group_of_point, counts = np.unique(groups, return_inverse=True, return_counts=True)
+    group_x = np.bincount(group_of_point, weights=x, minlength=len(keys)) / counts
+
+    if how == "max":
+        group_y = np.full(len(keys), -np.inf)
+        np.maximum.at(group_y, group_of_point, y)
+    else:
+        group_y = np.bincount(group_of_point, weights=y, minlength=len(keys)) / counts
+
+    return group_x, group_y
+
+
+class DetailLevels():
+    """A series at several levels of detail: every point, one point per week and one per month.
+
+    for_span() picks the most detailed level that still has few enough points for the width of
+    the chart in pixels, and thins that out with lttb() if even the monthly level has too many.
+    That way drawing a chart costs about the same whether the series has fifty points or fifty
+    thousand. The weekly and monthly levels are worked out the first time they are needed."""
+
+    POINTS_PER_PIXEL = 0.5  # more points than this can't be told apart on screen anyway
+
+    def __init__(self, x, y, how="max"):
+        order = np.argsort(x, kind="stable")
+        self.how = how
+        self.levels = [(np.asarray(x, dtype=np.float64)[order], np.asarray(y, dtype=np.float64)[order])]
+
+
+    def level(self, i):
+        while len(self.levels) <= i:
+            period = ("week", "month")[len(self.levels) - 1]
+            self.levels.append(aggregate(*self.levels[0], period, self.how))
+        return self.levels[i]
+
+
+    def for_span(self, span, pixel_width):
+        """Returns the (x, y) to draw for the dates in span (start, end), or for every date if span is None."""
+
+        max_points = max(int(pixel_width * self.POINTS_PER_PIXEL), 3)
+
+        finer = None
+        for i in range(3):
+            x, y = self.level(i)
+            if span is not None:
+                start, end = np.searchsorted(x, span[0], side="left"), np.searchsorted(x, span[1], side="right")
+                x, y = x[start:end], y[start:end]
+            if len(x) <= max_points:
+                # a short span can go from too many points straight to a handful, thinning the finer level looks better then
+                if finer is not None and len(x) < max_points // 4:
+                    return lttb(*finer, max_points)
+                return x, y
+            finer = x, y
+
+        return lttb(x, y, max_points)
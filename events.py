@@ -0,0 +1,71 @@
+from collections import namedtuple
+from contextlib import contextmanager
+
+
+# what the WorkoutManager tells its subscribers after each change. block_index is the block's
+# place in manager.training_blocks at the time of the change
+ExerciseAdded = namedtuple("ExerciseAdded", "name")
+BlockCreated = namedtuple("BlockCreated", "block_index block")
+BlockRemoved = namedtuple("BlockRemoved", "block_index block")
+TemplateAdded = namedtuple("TemplateAdded", "block_index block name exercises")
+WorkoutLogged = namedtuple("WorkoutLogged", "block_index block workout")
+TrackerRebuilt = namedtuple("TrackerRebuilt", "")  # the whole over time tracker was recomputed
+
+
+
+class EventBus():
+    """Hands the manager's change events to whoever subscribed to them.
+
+    subscribe(callback, ExerciseAdded, ...) calls callback(event) for those event types (every type
+    if none are given). With batched=True it's called once with a list of the events instead.
+
+    Inside a `with bus.batch():` block nothing is delivered until the block ends, then everything
+    that happened goes out together, so a subscriber that redraws something can do it once for a
+    whole import instead of once per workout. Batches can be nested, the outermost one delivers."""
+
+    def __init__(self):
+        self.subscribers = []  # [(event types or None for all, callback, batched)]
+        self.depth = 0
+        self.pending = []
+
+
+    def subscribe(self, callback, *event_types, batched=False):
+        self.subscribers.append((event_types or None, callback, batched))
+        return callback
+
+
+    def unsubscribe(self, callback):
+        self.subscribers = [subscriber for subscriber in self.subscribers if subscriber[1] != callback]
+
+
+    def publish(self, event):
+        if self.depth:
+            self.pending.append(event)
+        else:
+            self.deliver([event])
+
+
+    @contextmanager
+    def batch(self):
+        self.depth += 1
+        try:
+            yield self
+        finally:
+            self.depth -= 1
+            # what did happen still gets delivered if the batch stopped on an error
+            if self.depth == 0 and self.pending:
+                events, self.pending = self.pending, []
+                self.deliver(events)
+
+
+    def deliver(self, events):
+        # a copy, a subscriber may subscribe or unsubscribe while being called
+        for event_types, callback, batched in list(self.subscribers):
+            wanted = events if event_types is None else [event for event in events if isinstance(event, event_types)]
+            if not wanted:
+                continue
+            if batched:
+                callback(wanted)
+            else:
+                for event in wanted:
+                    callback(event)
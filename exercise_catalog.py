@@ -0,0 +1,27 @@
+import sys
+
+
+class ExerciseCatalog():
+    """Gives every exercise name a small integer id, so workouts can store the id instead of
+    their own copy of the name. Ids are handed out the first time a name is seen and never change."""
+
+    __slots__ = ("ids", "names")
+
+    def __init__(self):
+        self.ids = {}    # {exercise name: id}
+        self.names = []  # exercise name of each id
+
+    def id_of(self, name):
+        """Returns the id of the exercise, adding it to the catalog if it's new."""
+        exercise_id = self.ids.get(name)
+        if exercise_id is None:
+            exercise_id = self.ids[name] = len(self.names)
+            self.names.append(sys.intern(name))
+        return exercise_id
+
+    def name_of(self, exercise_id):
+        return self.names[exercise_id]
+
+
+# the one catalog shared by every workout
+catalog = ExerciseCatalog()
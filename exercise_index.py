@@ -0,0 +1,71 @@
+import bisect
+import re
+
+
+class ExerciseIndex():
+    """Finds exercises by what the user has typed so far, for the search boxes of the exercise lists.
+
+    Every word of every name (and the whole name) is kept in one sorted list, so the names with a
+    word starting with the search are found with a binary search instead of checking every name:
+    "pre" finds "Bench Press" and "Leg Press". When that finds nothing for a name, the letters of the
+    search in order anywhere in the name also count ("bnch" finds "Bench Press"), closer ones first."""
+
+    __slots__ = ("names", "keys")
+
+    def __init__(self, names=()):
+        self.names = []  # every exercise, sorted like manager.all_exercises
+        self.keys = []   # sorted (lowercase word or whole name, name)
+        for name in names:
+            self.add(name)
+
+
+    def add(self, name):
+        index = bisect.bisect_left(self.names, name)
+        if index < len(self.names) and self.names[index] == name:
+            return
+        self.names.insert(index, name)
+        for key in self.keys_of(name):
+            bisect.insort(self.keys, (key, name))
+
+
+    @staticmethod
+    def keys_of(name):
+        lowered = name.lower()
+        return {lowered} | set(lowered.split())
+
+
+    def prefix_matches(self, prefix):
+        """The names with a word (or the whole name) starting with prefix."""
+        matches = set()
+        i = bisect.bisect_left(self.keys, (prefix,))
+        while i < len(self.keys) and self.keys[i][0].startswith(prefix):
+            matches.add(self.keys[i][1])
+            i += 1
+        return matches
+
+
+    def search(self, query, limit=None):
+        """Returns the exercises matching query, the best matches first. An empty query gives every exercise."""
+
+        query = " ".join(query.lower().split())
+        if not query:
+            return self.names[:limit]
+
+        # names starting with the search first, then names with a later word starting with it
+        prefixed = sorted(self.prefix_matches(query), key=lambda name: (not name.lower().startswith(query), name.lower()))
+        if limit is not None and len(prefixed) >= limit:
+            return prefixed[:limit]
+
+        # then the rest of the names that have the letters in order, the tighter the better
+        letters = re.compile(".*?".join(re.escape(letter) for letter in query.replace(" ", "")))
+        already = set(prefixed)
+        fuzzy = []
+        for name in self.names:
+            if name not in already:
+                match = letters.search(name.lower())
+                if match:
+                    fuzzy.append((match.end() - match.start(), name.lower(), name))
+        fuzzy.sort()
+
+        results = prefixed + [name for _, _, name in fuzzy]
+        return results[:limit]
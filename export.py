@@ -0,0 +1,122 @@
+import argparse
+import csv
+from datetime import date
+from itertools import islice
+from exercise_catalog import catalog
+from workout import whole_number
+from tracker_series import Series
+from bulk_import import COLUMNS
+
+
+STAT_COLUMNS = ["exercise", "series", "date", "value"]
+BATCH_SIZE = 50000  # rows per Parquet/Arrow batch
+UNIX_EPOCH = date(1970, 1, 1).toordinal()
+
+
+def iter_set_rows(training_blocks):
+    """Yields every set of every workout as a flat row (one value per entry of COLUMNS), block by block.
+    Dates are ISO dates ("2025-06-23"), the same file can be read back with bulk_import.py."""
+
+    for block in training_blocks:
+        for workout in block.workouts:
+            workout_date = date.fromordinal(workout.day).isoformat()
+            for exercise_id, packed in workout.sets.items():
+                exercise = catalog.name_of(exercise_id)
+                for i in range(0, len(packed), 2):
+                    yield (block.starting_date, workout_date, workout.template_name, exercise, i // 2 + 1, int(packed[i]), whole_number(packed[i + 1]))
+
+
+def iter_stat_rows(tracker):
+    """Yields every point of every series of the over time tracker as a flat row (one value per entry of STAT_COLUMNS).
+    The series is "Volume" or a rep count for an exercise, and the name of the stat for "Stats"."""
+
+    for key in tracker:
+        if key == "Personal Bests":
+            continue
+        for name, series in tracker[key].items():
+            if isinstance(series, Series):
+                for day, value in zip(series.days, series.values):
+                    yield (key, name, date.fromordinal(day).isoformat(), whole_number(value))
+
+
+def write_csv(rows, columns, path):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        writer.writerows(rows)
+
+
+def write_columnar(rows, columns, path, file_format):
+    """Writes the rows to a Parquet ("parquet") or Arrow IPC ("arrow") file, BATCH_SIZE rows at a time.
+    Needs pyarrow, which the app itself doesn't."""
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise SystemExit("Exporting to Parquet or Arrow needs pyarrow (pip install pyarrow), or export to .csv instead.")
+
+    types = {"block": pa.string(), "date": pa.date32(), "template": pa.string(), "exercise": pa.string(), "set": pa.int32(),
+             "reps": pa.int32(), "weight": pa.float64(), "series": pa.string(), "value": pa.float64()}
+    schema = pa.schema([(column, types[column]) for column in columns])
+    date_index = columns.index("date")
+
+    if file_format == "parquet":
+        import pyarrow.parquet as pq
+        writer = pq.ParquetWriter(path, schema)
+        write = writer.write_batch
+    else:
+        import pyarrow.ipc as ipc
+        writer = ipc.new_file(path, schema)
+        write = writer.write_batch
+
+    try:
+        rows = iter(rows)
+        while True:
+            batch = list(islice(rows, BATCH_SIZE))
+            if not batch:
+                break
+            data = [list(column) for column in zip(*batch)]
+            data[date_index] = [date.fromisoformat(text).toordinal() - UNIX_EPOCH for text in data[date_index]]  # date32 counts days from 1970
+            write(pa.record_batch([pa.array(values, type=schema.field(i).type) for i, values in enumerate(data)], schema=schema))
+    finally:
+        writer.close()
+
+
+def export(manager, path, stats=False):
+    """Writes every set (or with stats, every point of the tracker) to path. The format comes from the
+    extension: .csv, .parquet or .arrow/.feather. Returns the number of rows written."""
+
+    manager.storage.load_everything(manager)
+    if stats:
+        rows, columns = iter_stat_rows(manager.over_time_tracker), STAT_COLUMNS
+    else:
+        rows, columns = iter_set_rows(manager.training_blocks), COLUMNS
+
+    count = 0
+    def counted(rows):
+        nonlocal count
+        for row in rows:
+            count += 1
+            yield row
+
+    if path.endswith(".parquet"):
+        write_columnar(counted(rows), columns, path, "parquet")
+    elif path.endswith((".arrow", ".feather")):
+        write_columnar(counted(rows), columns, path, "arrow")
+    else:
+        write_csv(counted(rows), columns, path)
+    return count
+
+
+
+if __name__ == "__main__":
+    from workout_manager import WorkoutManager
+
+    parser = argparse.ArgumentParser(description=f"Export every set as a flat table with the columns: {', '.join(COLUMNS)}.")
+    parser.add_argument("file", help="the file to write, .csv, .parquet or .arrow (Parquet and Arrow need pyarrow)")
+    parser.add_argument("--stats", action="store_true", help=f"export the over time tracker instead, with the columns: {', '.join(STAT_COLUMNS)}")
+    args = parser.parse_args()
+
+    manager = WorkoutManager()
+    count = export(manager, args.file, args.stats)
+    manager.close()
+    print(f"Exported {count} rows to {args.file}.")
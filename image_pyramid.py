@@ -0,0 +1,57 @@
+from collections import OrderedDict
+from PIL import Image
+
+
+class ImagePyramid():
+    """A picture that gets shown at whatever size the window is resized to.
+
+    The original is halved again and again when it's loaded, and each new size is made from the
+    smallest of those copies that's still at least as big, so shrinking a big picture doesn't
+    resample every pixel of the original. The last few sizes made are kept, least recently used
+    dropped first, so going back to a size (like un-maximizing the window) costs nothing.
+
+    convert is called on every resized picture before it's cached and returned, e.g. to turn it
+    into the image object a widget shows, so that isn't made again for a cached size either."""
+
+    CACHE_SIZE = 8
+    MIN_SIZE = 64  # stop halving before either side gets smaller than this
+
+    def __init__(self, image, convert=None, cache_size=CACHE_SIZE):
+        self.levels = [image]
+        while min(self.levels[-1].size) >= 2 * self.MIN_SIZE:
+            self.levels.append(self.levels[-1].reduce(2))  # averages each 2x2 block, quick and still smooth
+        self.convert = convert or (lambda image: image)
+        self.cache = OrderedDict()  # {(width, height): converted picture}, oldest used first
+        self.cache_size = cache_size
+
+
+    def source_for(self, size, fast=False):
+        """The smallest level at least size (width, height), or the original when stretching it bigger.
+        A fast preview can start from one up to half as big, stretching that is much quicker."""
+        need = (size[0] // 2, size[1] // 2) if fast else size
+        for level in reversed(self.levels):
+            if level.width >= need[0] and level.height >= need[1]:
+                return level
+        return self.levels[0]
+
+
+    def get(self, size, fast=False):
+        """The picture stretched to size (width, height).
+
+        fast uses a cheap filter for the previews shown while the window is being dragged, those are
+        made from a smaller level and aren't cached. Otherwise it's resized with LANCZOS, the best
+        looking filter, and kept for next time (a cached good one is also used for a fast request)."""
+
+        picture = self.cache.get(size)
+        if picture is not None:
+            self.cache.move_to_end(size)
+            return picture
+
+        source = self.source_for(size, fast)
+        if fast:
+            return self.convert(source.resize(size, Image.BILINEAR))
+
+        picture = self.cache[size] = self.convert(source.resize(size, Image.LANCZOS))
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return picture
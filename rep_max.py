@@ -0,0 +1,77 @@
+from workout import whole_number
+
+
+def estimated_1rm(weight, reps):
+    """Estimated one rep max of a set with the Epley formula (a single is its own 1RM)."""
+    if reps <= 0:
+        return 0.0
+    if reps == 1:
+        return float(weight)
+    return weight * (1 + reps / 30)
+
+
+
+class RepMaxIndex():
+    """The rep max table of each exercise: the heaviest weight ever done for each rep count and
+    the day it was first done, plus the best estimated 1RM of all of them.
+
+    An exercise's table is made from its series in the over time tracker the first time it's asked
+    for (see load), after that add_set() keeps it up to date in constant time per set and questions
+    like "best for 5 reps" are a dict lookup. Exercises that were never asked about aren't tracked,
+    so nothing has to be read at startup."""
+
+    __slots__ = ("tables", "best_e1rm")
+
+    def __init__(self):
+        self.tables = {}     # {exercise: {reps: [weight, day]}}
+        self.best_e1rm = {}  # {exercise: (e1rm, weight, reps, day)}
+
+
+    def loaded(self, exercise):
+        return exercise in self.tables
+
+
+    def load(self, exercise, entry):
+        """Builds the table of an exercise from its tracker entry ({"Volume": Series, "5": Series, ...})."""
+        self.tables[exercise] = {}
+        self.best_e1rm.pop(exercise, None)
+        for rep, series in entry.items():
+            if rep != "Volume":
+                for day, weight in zip(series.days, series.values):
+                    self.add_set(exercise, int(rep), weight, day)
+
+
+    def add_set(self, exercise, reps, weight, day):
+        """Counts one set (or the best set of a rep count in a workout) of an exercise whose table is loaded."""
+        table = self.tables[exercise]
+        best = table.get(reps)
+        # a heavier weight replaces the best, the same weight later on doesn't (the first time it was done is kept)
+        if best is None or weight > best[0] or (weight == best[0] and day < best[1]):
+            table[reps] = [weight, day]
+
+        e1rm = estimated_1rm(weight, reps)
+        best = self.best_e1rm.get(exercise)
+        if best is None or e1rm > best[0] or (e1rm == best[0] and day < best[3]):
+            self.best_e1rm[exercise] = (e1rm, weight, reps, day)
+
+
+    def clear(self):
+        """Forgets every table, for when the whole tracker is replaced."""
+        self.tables = {}
+        self.best_e1rm = {}
+
+
+    def best_at(self, exercise, reps):
+        """(weight, day) of the heaviest set done for exactly reps, or None."""
+        best = self.tables[exercise].get(reps)
+        return tuple(best) if best else None
+
+
+    def e1rm(self, exercise):
+        """(estimated 1RM, weight, reps, day) of the set with the best estimated 1RM, or None."""
+        return self.best_e1rm.get(exercise)
+
+
+    def table(self, exercise):
+        """The rows of the rep max table, fewest reps first: (reps, weight, day, estimated 1RM)."""
+        return [(reps, whole_number(float(weight)), day, estimated_1rm(weight, reps)) for reps, (weight, day) in sorted(self.tables[exercise].items())]
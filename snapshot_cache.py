@@ -0,0 +1,72 @@
+import hashlib
+import json
+import os
+import pickle
+
+
+# bump this whenever what gets cached changes shape, older caches are then just ignored
+CACHE_VERSION = 1
+
+
+def cache_path(path):
+    return path + ".cache"
+
+
+def file_signature(stat, contents):
+    """What a cache has to have been made from to still be good: the size, modified time and a hash of the file."""
+    return (CACHE_VERSION, stat.st_size, stat.st_mtime_ns, hashlib.sha256(contents).digest())
+
+
+def read_cached(path, convert):
+    """Returns convert(parsed JSON file), or None if the file is missing or broken.
+
+    Parsing a big pretty printed JSON file and converting it is slow, so the converted data is
+    pickled into a cache next to the file. Next time the cache is used as long as the file's size,
+    modified time and hash are still the ones it was made from, otherwise the JSON is read again
+    (and the cache remade). Whatever is returned is a fresh copy that the caller can change."""
+
+    try:
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            contents = f.read()
+    except FileNotFoundError:
+        return None
+    signature = file_signature(stat, contents)
+
+    cached = load_cache(cache_path(path), signature)
+    if cached is not None:
+        return cached
+
+    try:
+        data = convert(json.loads(contents))
+    except json.JSONDecodeError:
+        return None
+    # pickled right away, before the caller gets to change it
+    save_cache(cache_path(path), signature, data)
+    return data
+
+
+def load_cache(path, signature):
+    """The cached data if the cache was made from a file with this signature, otherwise None."""
+    try:
+        with open(path, "rb") as f:
+            # the signature is pickled on its own first so a stale cache isn't unpickled for nothing
+            if pickle.load(f) != signature:
+                return None
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # cut short or made by a different version of the code, the JSON is read instead
+        return None
+
+
+def save_cache(path, signature, data):
+    temp_path = path + ".tmp"
+    try:
+        with open(temp_path, "wb") as f:
+            pickle.dump(signature, f, pickle.HIGHEST_PROTOCOL)
+            pickle.dump(data, f, pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+    except Exception as e:
+        print(f"Could not save {path}: {e}")
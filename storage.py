@@ -0,0 +1,530 @@
+import argparse
+import json
+import os
+import pickle
+import sqlite3
+import threading
+from training_block import TrainingBlock
+from workout import Workout
+from tracker_series import Series, tracker_from_json, tracker_to_json, copy_tracker
+from background_writer import BackgroundWriter, write_text_atomic
+from snapshot_cache import read_cached
+
+
+STORAGE_KINDS = ("json", "journal", "sqlite")
+DEFAULT_STORAGE = "json"  # the journal and SQLite are opt-in (see migrate()), existing installs keep their JSON files
+
+
+# which data file each kind of change touches
+BLOCK_OPS = {"add_exercise", "add_block", "add_template", "add_workout", "remove_block"}
+TRACKER_OPS = {"add_exercise", "add_workout"}
+
+
+def read_storage_setting(settings_file):
+    """Returns which storage the user picked (see migrate()), or the default one."""
+    if os.path.exists(settings_file):
+        with open(settings_file, "r") as f:
+            try:
+                return json.load(f).get("storage", DEFAULT_STORAGE)
+            except json.JSONDecodeError:
+                pass
+    return DEFAULT_STORAGE
+
+
+def write_storage_setting(settings_file, kind):
+    with open(settings_file, "w") as f:
+        json.dump({"storage": kind}, f, indent=4)
+
+
+def pack_workouts(data):
+    """Pickles the workouts of each block of the block file on their own for its cache. Unpickling
+    every set of every workout would be most of the time a cached start takes, this way a block's
+    workouts are only unpickled when they're used (see TrainingBlock.saved_workouts())."""
+    for block in data.get("training_blocks", []):
+        block["workouts"] = pickle.dumps(block["workouts"], pickle.HIGHEST_PROTOCOL)
+    return data
+
+
+class JsonStorage():
+    """Keeps all of the data in the two JSON files and rewrites them on every change.
+
+    The files are written by a BackgroundWriter: a change only takes a quick copy of the data
+    (TrainingBlock.copy() and copy_tracker()), converting it to JSON and writing it happens on the
+    writer thread, and a burst of changes becomes one write of each file.
+
+    When the files are loaded what was read is also kept in a pickle cache next to each of them,
+    so the next start doesn't have to parse and convert the JSON again unless it changed."""
+
+    def __init__(self, data_file, tracker_file):
+        self.data_file = data_file
+        self.tracker_file = tracker_file
+        self.writer = BackgroundWriter()
+
+
+    def read_json(self, path, convert=None):
+        """Returns the parsed contents of the file (passed through convert), or None if it is missing or broken.
+        Unchanged files are read from their pickle cache instead, see snapshot_cache.py."""
+        return read_cached(path, convert or (lambda data: data))
+
+
+    def load_snapshot(self, manager):
+        """Loads both JSON files into the manager.
+        Returns the journal sequence number each file was written at (0 if none)."""
+
+        block_seq = 0
+        tracker_seq = 0
+
+        data = self.read_json(self.data_file, pack_workouts)
+        if data is not None:
+            manager.all_exercises = data.get("all_exercises", [])
+            manager.training_blocks = [TrainingBlock.from_dict(block) for block in data.get("training_blocks", [])]
+            block_seq = data.get("journal_seq", 0)
+
+        # loading in the data for the over time tracker, it's cached already converted to Series
+        data = self.read_json(self.tracker_file, lambda data: (data.pop("journal_seq", 0), tracker_from_json(data)))
+        if data is not None:
+            tracker_seq, manager.over_time_tracker = data
+
+        return block_seq, tracker_seq
+
+
+    def load(self, manager):
+        self.load_snapshot(manager)
+
+
+    def blocks_to_dict(self, all_exercises, training_blocks):
+        return {
+            "all_exercises": list(all_exercises),  # a copy, the snapshot mustn't change while it's being written
+            "training_blocks": [block.to_dict() for block in training_blocks]
+        }
+
+
+    def save_blocks(self, manager):
+        """Saves all training blocks to JSON."""
+        exercises = list(manager.all_exercises)
+        blocks = [block.copy() for block in manager.training_blocks]
+        self.writer.write(self.data_file, lambda: json.dumps(self.blocks_to_dict(exercises, blocks), indent=4))
+
+
+    def save_tracker(self, manager):
+        tracker = copy_tracker(manager.over_time_tracker)
+        self.writer.write(self.tracker_file, lambda: json.dumps(tracker_to_json(tracker), indent=4))
+
+
+    def record(self, manager, record):
+        """Persists one change to the manager. For plain JSON that means rewriting
+        whichever files the change touched."""
+        self.record_many(manager, [record])
+
+
+    def record_many(self, manager, records):
+        """Persists several changes that were all applied to the manager already (e.g. an import),
+        each file they touched is rewritten once."""
+        ops = {record["op"] for record in records}
+        if ops & BLOCK_OPS:
+            self.save_blocks(manager)
+        if ops & TRACKER_OPS:
+            self.save_tracker(manager)
+
+
+    def load_everything(self, manager):
+        """Makes sure nothing is left to be read later on. JSON always loads everything up front."""
+        pass
+
+
+    def save_all(self, manager):
+        """Writes the whole state of the manager (used when migrating between storages)."""
+        self.save_blocks(manager)
+        self.save_tracker(manager)
+
+
+    def close(self):
+        """Waits for the files still being written."""
+        self.writer.close()
+
+
+
+class JournalStorage(JsonStorage):
+    """Appends every change as one line to a journal file instead of rewriting the JSON files.
+
+    The two JSON files become a snapshot. Each snapshot remembers the sequence number of the last
+    journal record it contains, so loading is "read the snapshot, replay the newer records". Once
+    the journal gets long it is compacted: a new snapshot is handed to the BackgroundWriter like
+    JsonStorage does, and once both files are on disk the records they cover are dropped from the
+    journal."""
+
+    COMPACT_EVERY = 500  # number of journal records before a compaction is started
+
+    def __init__(self, data_file, tracker_file, journal_file):
+        super().__init__(data_file, tracker_file)
+        self.journal_file = journal_file
+
+        self.lock = threading.Lock()  # guards the journal file and the sequence numbers
+        self.seq = 0           # sequence number of the last record written
+        self.block_seq = 0     # last record included in the block snapshot on disk
+        self.tracker_seq = 0   # last record included in the tracker snapshot on disk
+        self.queued_seq = 0    # last record included in the snapshot last handed to the writer by compact()
+
+
+    def read_journal(self):
+        """Yields the records in the journal. A torn last line (from a crash mid-append) is ignored."""
+        if not os.path.exists(self.journal_file):
+            return
+        with open(self.journal_file, "r") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    return
+
+
+    def load(self, manager):
+        self.block_seq, self.tracker_seq = self.load_snapshot(manager)
+        self.queued_seq = min(self.block_seq, self.tracker_seq)
+        self.seq = max(self.block_seq, self.tracker_seq)
+
+        # replay everything newer than the snapshot, each half only if that file hasn't seen it yet
+        for record in self.read_journal():
+            seq = record["seq"]
+            if seq > self.block_seq or seq > self.tracker_seq:
+                manager.apply(record, blocks=seq > self.block_seq, tracker=seq > self.tracker_seq)
+            self.seq = max(self.seq, seq)
+
+
+    def record(self, manager, record):
+        self.record_many(manager, [record])
+
+
+    def record_many(self, manager, records):
+        with self.lock:
+            lines = []
+            for record in records:
+                self.seq += 1
+                lines.append(json.dumps(dict(record, seq=self.seq)) + "\n")
+            with open(self.journal_file, "a") as f:
+                f.writelines(lines)
+
+        if self.seq - self.queued_seq >= self.COMPACT_EVERY:
+            self.compact(manager)
+
+
+    def compact(self, manager):
+        """Hands a fresh snapshot of both files to the writer, the journal is trimmed once they're written."""
+        self.queued_seq = self.seq
+        self.save_blocks(manager)
+        self.save_tracker(manager)
+
+
+    # the snapshots go through the BackgroundWriter, each one tagged with the journal sequence number it
+    # was taken at. Only the newest text of a file is ever written, so the files on disk only move forward,
+    # and snapshot_written() trims the journal up to what both of them contain
+    def save_blocks(self, manager):
+        seq = self.seq
+        exercises = list(manager.all_exercises)
+        blocks = [block.copy() for block in manager.training_blocks]
+        self.writer.write(self.data_file, lambda: json.dumps(dict(self.blocks_to_dict(exercises, blocks), journal_seq=seq)),
+                          done=lambda: self.snapshot_written(block_seq=seq))
+
+
+    def save_tracker(self, manager):
+        seq = self.seq
+        tracker = copy_tracker(manager.over_time_tracker)
+        self.writer.write(self.tracker_file, lambda: json.dumps(dict(tracker_to_json(tracker), journal_seq=seq)),
+                          done=lambda: self.snapshot_written(tracker_seq=seq))
+
+
+    def snapshot_written(self, block_seq=None, tracker_seq=None):
+        """Called on the writer thread once a snapshot file is on disk."""
+        with self.lock:
+            trimmed = min(self.block_seq, self.tracker_seq)
+            self.block_seq = max(self.block_seq, block_seq or 0)
+            self.tracker_seq = max(self.tracker_seq, tracker_seq or 0)
+            if min(self.block_seq, self.tracker_seq) > trimmed:
+                self.trim_journal(min(self.block_seq, self.tracker_seq))
+
+
+    def trim_journal(self, seq):
+        """Drops the journal records that are already part of the snapshot. Call with the lock held."""
+        remaining = [json.dumps(record) + "\n" for record in self.read_journal() if record["seq"] > seq]
+        write_text_atomic(self.journal_file, "".join(remaining))
+
+
+    def save_all(self, manager):
+        # nothing still being written may trim the new journal with an old sequence number
+        self.writer.flush()
+        with self.lock:
+            if os.path.exists(self.journal_file):
+                os.remove(self.journal_file)
+            self.seq = self.block_seq = self.tracker_seq = 0
+        self.compact(manager)
+
+
+
+class LazyTracker(dict):
+    """The over time tracker for storages that can read a single entry of it at a time.
+    An entry (an exercise, "Personal Bests" or "Stats") is read the first time it is looked up.
+    Iterating only sees the entries read so far, call load_all() to read the rest."""
+
+    def __init__(self, keys, loader):
+        super().__init__()
+        self.known_keys = set(keys)
+        self.loader = loader
+
+    def __missing__(self, key):
+        if key not in self.known_keys:
+            raise KeyError(key)
+        value = self.loader(key)
+        dict.__setitem__(self, key, value)
+        return value
+
+    def __contains__(self, key):
+        return key in self.known_keys or dict.__contains__(self, key)
+
+    def __setitem__(self, key, value):
+        self.known_keys.add(key)
+        dict.__setitem__(self, key, value)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def load_all(self):
+        for key in self.known_keys:
+            self[key]
+
+
+
+class SqliteStorage():
+    """Keeps the data in a SQLite database with one row per block, template, workout and set.
+
+    Only the block headers, templates and exercise names are read at startup. The workouts of a
+    block are read when the block's workouts are first used, and each tracker entry is computed
+    from the sets table (indexed by exercise and by date) when it is first looked up."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS exercises (name TEXT PRIMARY KEY);
+        CREATE TABLE IF NOT EXISTS blocks (id INTEGER PRIMARY KEY, starting_date, workouts_per_week);
+        CREATE TABLE IF NOT EXISTS templates (id INTEGER PRIMARY KEY, block_id INTEGER, name TEXT, exercises TEXT);
+        CREATE TABLE IF NOT EXISTS workouts (id INTEGER PRIMARY KEY, block_id INTEGER, date TEXT, day INTEGER, template_name TEXT);
+        CREATE TABLE IF NOT EXISTS sets (id INTEGER PRIMARY KEY, workout_id INTEGER, exercise TEXT, set_index INTEGER, reps NUMERIC, weight NUMERIC);
+        CREATE TABLE IF NOT EXISTS personal_bests (exercise TEXT PRIMARY KEY, reps NUMERIC, weight NUMERIC, date TEXT);
+
+        CREATE INDEX IF NOT EXISTS sets_by_exercise ON sets (exercise, workout_id);
+        CREATE INDEX IF NOT EXISTS sets_by_workout ON sets (workout_id);
+        CREATE INDEX IF NOT EXISTS workouts_by_day ON workouts (day);
+        CREATE INDEX IF NOT EXISTS workouts_by_block ON workouts (block_id, day);
+        CREATE INDEX IF NOT EXISTS templates_by_block ON templates (block_id);
+    """
+
+    def __init__(self, db_file):
+        self.db_file = db_file
+        self.conn = sqlite3.connect(db_file)
+        self.conn.executescript(self.SCHEMA)
+        self.block_ids = [] # database id of each block in manager.training_blocks, same order
+
+
+    def load(self, manager):
+        self.block_ids = []
+        manager.all_exercises = [name for (name,) in self.conn.execute("SELECT name FROM exercises ORDER BY name")]
+        manager.training_blocks = []
+
+        for block_id, starting_date, workouts_per_week in self.conn.execute("SELECT id, starting_date, workouts_per_week FROM blocks ORDER BY id"):
+            block = TrainingBlock(starting_date, workouts_per_week)
+            for name, exercises in self.conn.execute("SELECT name, exercises FROM templates WHERE block_id = ? ORDER BY id", (block_id,)):
+                block.add_template(name, json.loads(exercises))
+            block.workout_loader = lambda block_id=block_id: self.load_workouts(block_id)
+
+            manager.training_blocks.append(block)
+            self.block_ids.append(block_id)
+
+        manager.over_time_tracker = LazyTracker(manager.all_exercises + ["Personal Bests", "Stats"], self.load_tracker_entry)
+
+
+    def load_workouts(self, block_id):
+        """Reads the workouts of one block with their sets."""
+        workouts = {}
+        entries = {}
+        for workout_id, date, template_name in self.conn.execute("SELECT id, date, template_name FROM workouts WHERE block_id = ? ORDER BY day, id", (block_id,)):
+            workouts[workout_id] = Workout(template_name, date)
+            entries[workout_id] = {}
+
+        rows = self.conn.execute("""SELECT s.workout_id, s.exercise, s.reps, s.weight FROM sets s JOIN workouts w ON w.id = s.workout_id
+                                    WHERE w.block_id = ? ORDER BY s.id""", (block_id,))
+        for workout_id, exercise, reps, weight in rows:
+            entries[workout_id].setdefault(exercise, []).append([reps, weight])
+
+        for workout_id, workout in workouts.items():
+            workout.add_entry(entries[workout_id])
+        return list(workouts.values())
+
+
+    def load_tracker_entry(self, key):
+        """Computes one entry of the over time tracker from the database, in the same layout the JSON file uses."""
+
+        if key == "Personal Bests":
+            return {exercise: [reps, weight, date] for exercise, reps, weight, date in self.conn.execute("SELECT exercise, reps, weight, date FROM personal_bests")}
+
+        # volume is int(weight) * int(reps) like add_workout_to_tracker() counts it (CAST cuts off the fraction the same way)
+        if key == "Stats":
+            total_reps, total_volume = self.conn.execute("SELECT COALESCE(SUM(reps), 0), COALESCE(SUM(CAST(reps AS INTEGER) * CAST(weight AS INTEGER)), 0) FROM sets").fetchone()
+            stats = {"Total Rep #": total_reps, "Total Volume": total_volume, "Rep # Per Workout": Series(), "Volume Per Workout": Series()}
+            rows = self.conn.execute("""SELECT w.day, COALESCE(SUM(s.reps), 0), COALESCE(SUM(CAST(s.reps AS INTEGER) * CAST(s.weight AS INTEGER)), 0)
+                                        FROM workouts w LEFT JOIN sets s ON s.workout_id = w.id GROUP BY w.id ORDER BY w.day, w.id""")
+            for day, reps, volume in rows:
+                stats["Rep # Per Workout"].append(day, reps)
+                stats["Volume Per Workout"].append(day, volume)
+            return stats
+
+        # an exercise: volume per workout and the heaviest weight for each rep count per workout, in date order
+        entry = {"Volume": Series()}
+        rows = self.conn.execute("""SELECT w.day, SUM(CAST(s.reps AS INTEGER) * CAST(s.weight AS INTEGER)) FROM sets s JOIN workouts w ON w.id = s.workout_id
+                                    WHERE s.exercise = ? GROUP BY s.workout_id ORDER BY w.day, s.workout_id""", (key,))
+        for day, volume in rows:
+            entry["Volume"].append(day, volume)
+
+        rows = self.conn.execute("""SELECT w.day, s.reps, MAX(s.weight) FROM sets s JOIN workouts w ON w.id = s.workout_id
+                                    WHERE s.exercise = ? GROUP BY s.workout_id, s.reps ORDER BY w.day, s.workout_id, MIN(s.id)""", (key,))
+        for day, reps, weight in rows:
+            entry.setdefault(str(reps), Series()).append(day, weight)
+        return entry
+
+
+    def insert_block(self, block):
+        cursor = self.conn.execute("INSERT INTO blocks (starting_date, workouts_per_week) VALUES (?, ?)", (block.starting_date, block.workouts_per_week))
+        self.block_ids.append(cursor.lastrowid)
+        return cursor.lastrowid
+
+
+    def insert_template(self, block_id, name, exercises):
+        self.conn.execute("INSERT INTO templates (block_id, name, exercises) VALUES (?, ?, ?)", (block_id, name, json.dumps(exercises)))
+
+
+    def insert_workout(self, block_id, workout):
+        cursor = self.conn.execute("INSERT INTO workouts (block_id, date, day, template_name) VALUES (?, ?, ?, ?)",
+                                   (block_id, workout.date, workout.day, workout.template_name))
+        self.conn.executemany("INSERT INTO sets (workout_id, exercise, set_index, reps, weight) VALUES (?, ?, ?, ?, ?)",
+                              [(cursor.lastrowid, exercise, i, reps, weight)
+                               for exercise, sets in workout.entries.items() for i, (reps, weight) in enumerate(sets)])
+
+
+    def save_personal_best(self, manager, exercise):
+        reps, weight, date = manager.over_time_tracker["Personal Bests"][exercise]
+        self.conn.execute("INSERT OR REPLACE INTO personal_bests (exercise, reps, weight, date) VALUES (?, ?, ?, ?)", (exercise, reps, weight, date))
+
+
+    def record(self, manager, record):
+        """Writes one change as a single transaction touching only the rows involved."""
+        self.record_many(manager, [record])
+
+
+    def record_many(self, manager, records):
+        """Writes several changes that were all applied to the manager already as one transaction."""
+        with self.conn:
+            for record in records:
+                self.write_record(manager, record)
+
+
+    def write_record(self, manager, record):
+        op = record["op"]
+
+        if op == "add_exercise":
+            self.conn.execute("INSERT OR IGNORE INTO exercises (name) VALUES (?)", (record["name"],))
+            self.save_personal_best(manager, record["name"])
+
+        elif op == "add_block":
+            # the block added next (with several changes at once it's not always the last one yet)
+            self.insert_block(manager.training_blocks[len(self.block_ids)])
+
+        elif op == "add_template":
+            self.insert_template(self.block_ids[record["block"]], record["name"], record["exercises"])
+
+        elif op == "add_workout":
+            workout = Workout.from_dict(record["workout"])
+            self.insert_workout(self.block_ids[record["block"]], workout)
+            for exercise in workout.entries:
+                self.save_personal_best(manager, exercise)
+
+        elif op == "remove_block":
+            block_id = self.block_ids.pop(record["block"])
+            self.conn.execute("DELETE FROM sets WHERE workout_id IN (SELECT id FROM workouts WHERE block_id = ?)", (block_id,))
+            self.conn.execute("DELETE FROM workouts WHERE block_id = ?", (block_id,))
+            self.conn.execute("DELETE FROM templates WHERE block_id = ?", (block_id,))
+            self.conn.execute("DELETE FROM blocks WHERE id = ?", (block_id,))
+
+
+    def load_everything(self, manager):
+        for block in manager.training_blocks:
+            block.workouts
+        # after a rebuild the tracker is a plain dict that already has everything
+        if isinstance(manager.over_time_tracker, LazyTracker):
+            manager.over_time_tracker.load_all()
+
+
+    def save_blocks(self, manager):
+        # nothing to do, record() already wrote the rows of every change to the blocks as it happened
+        pass
+
+
+    def save_tracker(self, manager):
+        # the tracker is computed from the sets, only the personal bests are stored
+        with self.conn:
+            for exercise in manager.over_time_tracker["Personal Bests"]:
+                self.save_personal_best(manager, exercise)
+
+
+    def save_all(self, manager):
+        """Replaces everything in the database with the state of the manager."""
+        # workouts and tracker entries not read yet would be read from the rows deleted below
+        self.load_everything(manager)
+        with self.conn:
+            for table in ("sets", "workouts", "templates", "blocks", "exercises", "personal_bests"):
+                self.conn.execute(f"DELETE FROM {table}")
+            self.block_ids = []
+
+            self.conn.executemany("INSERT INTO exercises (name) VALUES (?)", [(name,) for name in manager.all_exercises])
+            for block in manager.training_blocks:
+                block_id = self.insert_block(block)
+                for template in block.templates:
+                    self.insert_template(block_id, template.name, template.exercises)
+                for workout in block.workouts:
+                    self.insert_workout(block_id, workout)
+
+            for exercise in manager.over_time_tracker.get("Personal Bests", {}):
+                self.save_personal_best(manager, exercise)
+
+
+    def close(self):
+        self.conn.close()
+
+
+
+def migrate(target_kind, source_kind=None):
+    """Copies all of the data from one storage to another and makes the target the one the app uses."""
+    from workout_manager import WorkoutManager
+
+    source_kind = source_kind or read_storage_setting(WorkoutManager.SETTINGS_FILE)
+    manager = WorkoutManager(storage=source_kind)
+    manager.storage.load_everything(manager)
+
+    target = manager.make_storage(target_kind)
+    target.save_all(manager)
+
+    # plain JSON doesn't know about the journal, so it must not be left around to be replayed later
+    if target_kind == "json" and os.path.exists(WorkoutManager.JOURNAL_FILE):
+        os.remove(WorkoutManager.JOURNAL_FILE)
+
+    target.close()
+    manager.close()
+    write_storage_setting(WorkoutManager.SETTINGS_FILE, target_kind)
+    print(f"Moved {len(manager.training_blocks)} training blocks from '{source_kind}' to '{target_kind}' storage.")
+
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Move the workout data to a different storage and switch the app over to it.")
+    parser.add_argument("target", choices=STORAGE_KINDS, help="storage to move the data to")
+    parser.add_argument("--source", choices=STORAGE_KINDS, help="storage to read the data from (default: the one currently used)")
+    args = parser.parse_args()
+    migrate(args.target, args.source)
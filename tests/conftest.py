@@ -0,0 +1,87 @@
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# workout_manager copies the default data files into the user's app data folder as soon as it's
+# imported, point that somewhere temporary so the tests never touch the real data
+HOME = tempfile.mkdtemp(prefix="workout_tests_")
+for variable in ("HOME", "USERPROFILE", "APPDATA", "LOCALAPPDATA"):
+    os.environ[variable] = HOME
+
+from workout_manager import WorkoutManager  # noqa: E402
+from workout import Workout  # noqa: E402
+from tracker_series import tracker_to_json  # noqa: E402
+
+
+# the sets every logged workout gets unless a test gives its own, weights can have a fraction
+SETS = {"Squat": [[5, 225], [5, 235], [3, 245]], "Bench Press": [[8, 135], [8, 140.5], [6, 140]]}
+
+
+@pytest.fixture
+def data_files(tmp_path, monkeypatch):
+    """Gives every test its own fresh copy of the default data files."""
+    for name in ("training_block_data.json", "training_data.json"):
+        shutil.copy(os.path.join(ROOT, f"default_{name}"), tmp_path / name)
+    monkeypatch.setattr(WorkoutManager, "DATA_FILE", str(tmp_path / "training_block_data.json"))
+    monkeypatch.setattr(WorkoutManager, "TOTAL_DATA_FILE", str(tmp_path / "training_data.json"))
+    monkeypatch.setattr(WorkoutManager, "JOURNAL_FILE", str(tmp_path / "training_journal.jsonl"))
+    monkeypatch.setattr(WorkoutManager, "SQLITE_FILE", str(tmp_path / "training_data.sqlite3"))
+    monkeypatch.setattr(WorkoutManager, "SETTINGS_FILE", str(tmp_path / "settings.json"))
+    return tmp_path
+
+
+@pytest.fixture
+def open_manager(data_files):
+    """open_manager(storage) loads a WorkoutManager from the test's data files, they're all closed at the end."""
+    managers = []
+
+    def open_manager(storage=None):
+        manager = WorkoutManager(storage)
+        managers.append(manager)
+        return manager
+
+    yield open_manager
+    for manager in managers:
+        manager.close()
+
+
+@pytest.fixture
+def log_workouts():
+    """log_workouts(manager, dates) adds the exercises, a block with a template and one workout per date
+    (with SETS, or the sets given) the way the app does. Returns the block."""
+
+    def log_workouts(manager, dates, sets=SETS, starting_date="June 2, 2025"):
+        for name in sets:
+            if name not in manager.all_exercises:
+                manager.add_exercise(name)
+        manager.add_training_block(starting_date, 3)
+        block = manager.training_blocks[-1]
+        manager.add_template_to_block(block, "Day A", list(sets))
+        for workout_date in dates:
+            workout = Workout("Day A", workout_date)
+            workout.add_entry(sets)
+            manager.add_workout(block, workout)
+        return block
+
+    return log_workouts
+
+
+def state(manager):
+    """Everything a manager holds in a form that can be compared with ==."""
+    manager.storage.load_everything(manager)
+    return {
+        "all_exercises": list(manager.all_exercises),
+        "training_blocks": [dict(block.to_dict(), workouts=[workout.to_dict() for workout in block.workouts])
+                            for block in manager.training_blocks],
+        "tracker": tracker_to_json(manager.over_time_tracker),
+    }
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(HOME, ignore_errors=True)
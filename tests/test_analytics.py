@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from analytics import Analytics, add_per_set_columns
+from bulk_import import import_workouts
+from tracker_engine import flatten_sets
+from workout import Workout
+
+
+DATES = ["June 2, 2025", "June 4, 2025", "June 9, 2025", "June 16, 2025"]
+
+
+def assert_same_columns(cols, expected):
+    assert set(cols) == set(expected)
+    for name, column in expected.items():
+        if isinstance(column, np.ndarray):
+            assert np.array_equal(cols[name], column), name
+        else:
+            assert list(cols[name]) == list(column), name
+
+
+def test_volume_and_sets_by_week(open_manager, log_workouts):
+    manager = open_manager()
+    log_workouts(manager, DATES, sets={"Squat": [[5, 200], [5, 200.5]]})
+    analytics = Analytics(manager)
+
+    weeks, volumes = analytics.volume_by("week", "Squat")
+    # June 2 and 4 are in the same week, weights count in whole pounds like the tracker
+    assert volumes.tolist() == [4000, 2000, 2000]
+    assert analytics.sets_by("week")[1].tolist() == [4, 2, 2]
+    assert analytics.trend("Squat", "weight")["per_week"] == pytest.approx(0, abs=1e-9)
+
+
+def test_logged_workouts_are_added_on(open_manager, log_workouts):
+    manager = open_manager()
+    block = log_workouts(manager, DATES[:2])
+    analytics = Analytics(manager)
+    analytics.volume_by("week")
+    cols = analytics.cols
+
+    workout = Workout("Day A", "June 20, 2025")
+    workout.add_entry({"Deadlift": [[5, 315]], "Squat": [[5, 240]]})
+    manager.add_exercise("Deadlift")
+    manager.add_workout(block, workout)
+    imported = Workout("Day A", "June 23, 2025")
+    imported.add_entry({"Squat": [[3, 250]]})
+    import_workouts(manager, [("June 2, 2025", imported)])
+
+    # the columns grew from the events instead of being made again, and match what making them again gives
+    analytics.volume_by("week")
+    assert analytics.cols is cols
+    assert_same_columns(analytics.cols, add_per_set_columns(flatten_sets(manager.training_blocks)))
+    assert analytics.volume_by("week", "Deadlift")[1].tolist() == [1575]
+
+
+def test_other_changes_make_the_columns_again(open_manager, log_workouts):
+    manager = open_manager()
+    log_workouts(manager, DATES)
+    analytics = Analytics(manager)
+    analytics.volume_by("week")
+    cols = analytics.cols
+
+    log_workouts(manager, DATES[:1], starting_date="June 30, 2025")
+    manager.remove_last_training_block()
+    analytics.volume_by("week")
+    assert analytics.cols is not cols
+    assert_same_columns(analytics.cols, add_per_set_columns(flatten_sets(manager.training_blocks)))
@@ -0,0 +1,28 @@
+import pytest
+
+from background_writer import BackgroundWriter
+
+
+def test_only_the_newest_text_is_written(tmp_path):
+    writer = BackgroundWriter()
+    path = str(tmp_path / "file.json")
+    written = []
+    for i in range(5):
+        writer.write(path, lambda i=i: str(i), done=lambda i=i: written.append(i))
+    writer.flush()
+
+    assert (tmp_path / "file.json").read_text() == "4"
+    assert written == [4]
+
+
+def test_flush_raises_a_failed_write(tmp_path):
+    writer = BackgroundWriter()
+    done = []
+    writer.write(str(tmp_path / "missing folder" / "file.json"), lambda: "text", done=lambda: done.append(True))
+    writer.write(str(tmp_path / "file.json"), lambda: "text")
+
+    with pytest.raises(FileNotFoundError):
+        writer.flush()
+    assert not done
+    assert (tmp_path / "file.json").read_text() == "text"
+    writer.flush()  # the error is only raised once
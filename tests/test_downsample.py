@@ -0,0 +1,45 @@
+import numpy as np
+
+from downsample import DetailLevels, aggregate, lttb
+
+
+def test_lttb_keeps_the_ends_and_the_spikes():
+    x = np.arange(1000, dtype=np.float64)
+    y = np.sin(x / 50)
+    y[500] = 10  # a single spike has to survive the thinning
+
+    small_x, small_y = lttb(x, y, 50)
+    assert len(small_x) == 50
+    assert small_x[0] == 0 and small_x[-1] == 999
+    assert np.all(np.diff(small_x) > 0)
+    assert 10 in small_y
+
+
+def test_lttb_leaves_short_series_alone():
+    x, y = np.arange(10.0), np.arange(10.0)
+    assert lttb(x, y, 10)[0] is x
+    assert lttb(x, y, 2)[0] is x
+
+
+def test_aggregate_by_week():
+    # 1970-01-05 (day 4) was a Monday, so days 4-10 are one week and 11 starts the next
+    x = np.array([4.0, 6.0, 10.0, 11.0])
+    y = np.array([1.0, 5.0, 3.0, 2.0])
+
+    assert aggregate(x, y, "week", "max")[1].tolist() == [5.0, 2.0]
+    week_x, week_y = aggregate(x, y, "week", "mean")
+    assert week_x.tolist() == [20 / 3, 11.0]
+    assert week_y.tolist() == [3.0, 2.0]
+
+
+def test_detail_levels_fit_the_chart_width():
+    x = np.arange(20000, dtype=np.float64)  # a point a day for about 55 years
+    levels = DetailLevels(x, np.random.default_rng(1).random(len(x)))
+
+    for width in (100, 800, 3000):
+        shown_x, _ = levels.for_span(None, width)
+        assert 3 <= len(shown_x) <= width * DetailLevels.POINTS_PER_PIXEL
+
+    # a short span is drawn with every point in it
+    shown_x, _ = levels.for_span((100, 150), 800)
+    assert shown_x.tolist() == x[100:151].tolist()
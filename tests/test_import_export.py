@@ -0,0 +1,94 @@
+import json
+import os
+
+import pytest
+
+from bulk_import import import_file
+from conftest import state
+from events import WorkoutLogged
+from export import export
+from storage import STORAGE_KINDS
+from tracker_series import tracker_to_json
+from workout_manager import WorkoutManager
+
+
+DATES = ["June 02, 2025", "June 04, 2025", "June 06, 2025"]
+
+
+def reset_data_files(data_files):
+    """Puts the default (empty) data files back, as if the app was just installed."""
+    for name in os.listdir(data_files):
+        os.remove(data_files / name)
+    for name in ("training_block_data.json", "training_data.json"):
+        with open(os.path.join(os.path.dirname(os.path.dirname(__file__)), f"default_{name}")) as f:
+            (data_files / name).write_text(f.read())
+
+
+@pytest.mark.parametrize("storage", STORAGE_KINDS)
+def test_export_then_import(open_manager, log_workouts, data_files, tmp_path_factory, storage):
+    folder = tmp_path_factory.mktemp("export")
+    manager = open_manager(storage)
+    log_workouts(manager, DATES)
+    log_workouts(manager, DATES[1:], sets={"Deadlift": [[5, 315]], "Squat": [[2, 250.5]]}, starting_date="June 3, 2025")
+    export(manager, str(folder / "first.csv"))
+    tracker = tracker_to_json(manager.over_time_tracker)
+    manager.close()
+
+    reset_data_files(data_files)
+    manager = open_manager(storage)
+    counts = import_file(manager, str(folder / "first.csv"))
+    assert counts == {"workouts": 5, "sets": 22, "blocks": 2, "exercises": 3}
+    export(manager, str(folder / "second.csv"))
+    assert (folder / "second.csv").read_text() == (folder / "first.csv").read_text()
+    assert tracker_to_json(manager.over_time_tracker) == tracker
+    expected = state(manager)
+    manager.close()
+
+    assert state(open_manager(storage)) == expected
+
+
+@pytest.mark.parametrize("storage", STORAGE_KINDS)
+def test_import_keeps_the_personal_bests(open_manager, log_workouts, tmp_path_factory, storage):
+    manager = open_manager(storage)
+    log_workouts(manager, DATES)
+    # a best from before the history the app has, it isn't in any of the workouts
+    manager.over_time_tracker["Personal Bests"]["Squat"] = [1, 405, "May 01, 2025"]
+    manager.save_tracker_data()
+
+    path = tmp_path_factory.mktemp("import") / "more.csv"
+    path.write_text("block,date,template,exercise,set,reps,weight\n"
+                    "\"June 2, 2025\",2025-06-09,Day A,Squat,1,5,250\n"
+                    "\"June 2, 2025\",2025-06-09,Day A,Bench Press,1,3,145\n")
+    import_file(manager, str(path))
+
+    bests = manager.over_time_tracker["Personal Bests"]
+    assert bests["Squat"] == [1, 405, "May 01, 2025"]
+    assert bests["Bench Press"] == [3, 145, "June 09, 2025"]
+    assert manager.over_time_tracker["Squat"]["5"].values[-1] == 250
+    manager.close()
+
+    manager = open_manager(storage)
+    assert manager.over_time_tracker["Personal Bests"]["Squat"] == [1, 405, "May 01, 2025"]
+    assert len(manager.training_blocks) == 1 and len(manager.training_blocks[0].workouts) == 4
+
+
+def test_import_publishes_an_event_per_change_after_saving(open_manager, tmp_path):
+    manager = open_manager("journal")
+    seen = []
+
+    def logged(events):
+        # the journal has every change by the time anyone hears about them
+        with open(WorkoutManager.JOURNAL_FILE) as f:
+            seen.append((len(events), sum(1 for _ in f)))
+
+    manager.events.subscribe(logged, WorkoutLogged, batched=True)
+    path = tmp_path / "history.jsonl"
+    rows = [{"block": "June 02, 2025", "date": date, "template": "Day A", "exercise": "Squat", "reps": 5, "weight": 225} for date in DATES]
+    path.write_text("\n".join(json.dumps(row) for row in rows[:2]) + "\nnot json\n" + json.dumps(rows[2]) + "\n")
+    version = manager.data_version
+
+    counts = import_file(manager, str(path))
+    # a block, an exercise, three workouts and a template
+    assert manager.data_version == version + 6
+    assert seen == [(3, 6)]
+    assert counts["workouts"] == 3
@@ -0,0 +1,51 @@
+import json
+import os
+
+from conftest import state
+from snapshot_cache import cache_path, read_cached
+
+
+def test_cache_is_used_until_the_file_changes(tmp_path):
+    path = str(tmp_path / "data.json")
+    with open(path, "w") as f:
+        json.dump({"a": 1}, f)
+    converted = []
+
+    def convert(data):
+        converted.append(data)
+        return data
+
+    assert read_cached(path, convert) == {"a": 1}
+    assert read_cached(path, convert) == {"a": 1}
+    assert len(converted) == 1
+    assert os.path.exists(cache_path(path))
+
+    with open(path, "w") as f:
+        json.dump({"a": 2}, f)
+    assert read_cached(path, convert) == {"a": 2}
+    assert len(converted) == 2
+
+
+def test_broken_cache_or_file(tmp_path):
+    path = str(tmp_path / "data.json")
+    assert read_cached(path, dict) is None
+
+    with open(path, "w") as f:
+        f.write('{"a": ')
+    assert read_cached(path, dict) is None
+
+    with open(path, "w") as f:
+        json.dump({"a": 1}, f)
+    read_cached(path, dict)
+    with open(cache_path(path), "wb") as f:
+        f.write(b"not a pickle")
+    assert read_cached(path, dict) == {"a": 1}
+
+
+def test_cached_start_loads_the_same_data(open_manager, log_workouts):
+    manager = open_manager()
+    log_workouts(manager, ["June 2, 2025", "June 4, 2025"])
+    manager.close()
+
+    expected = state(open_manager())  # reads the JSON and makes the caches
+    assert state(open_manager()) == expected  # from the caches
@@ -0,0 +1,39 @@
+from collections import OrderedDict
+
+from workoutapp_gui import SeeStatesScreen
+
+
+def make_screen(manager):
+    # the screen's caches without its widgets, there is no display to make them on
+    screen = SeeStatesScreen.__new__(SeeStatesScreen)
+    screen.manager = manager
+    screen.render_cache = OrderedDict()
+    screen.image_cache = OrderedDict()
+    screen.make_charts = lambda exercise, span: [f"{exercise} chart"]
+    return screen
+
+
+def test_chart_caches_keep_the_recently_used_exercises(open_manager):
+    screen = make_screen(open_manager())
+    exercises = [f"Exercise {i}" for i in range(SeeStatesScreen.CHART_CACHE_SIZE + 5)]
+    for exercise in exercises:
+        screen.get_charts(exercise)
+        screen.image_cache.setdefault((exercise, 0, None), [None])
+        screen.get_charts(exercises[0])  # looked at again and again, so it stays
+
+    assert len(screen.render_cache) == SeeStatesScreen.CHART_CACHE_SIZE
+    assert list(screen.image_cache) == list(screen.render_cache)
+    assert (exercises[0], 0, None) in screen.render_cache
+    assert (exercises[1], 0, None) not in screen.render_cache
+
+
+def test_chart_caches_drop_old_tracker_versions(open_manager, log_workouts):
+    manager = open_manager()
+    screen = make_screen(manager)
+    screen.get_charts("Squat")
+    screen.image_cache.setdefault(("Squat", manager.tracker_version, None), [None])
+
+    log_workouts(manager, ["June 2, 2025"])
+    screen.get_charts("Squat")
+    assert list(screen.render_cache) == [("Squat", manager.tracker_version, None)]
+    assert not screen.image_cache
@@ -0,0 +1,121 @@
+import json
+import os
+from itertools import permutations
+
+import pytest
+
+from conftest import state
+from storage import STORAGE_KINDS, JournalStorage, migrate, read_storage_setting
+from workout_manager import WorkoutManager
+
+
+DATES = ["June 2, 2025", "June 04, 2025", "June 6, 2025", "May 30, 2025"]
+
+
+@pytest.mark.parametrize("storage", STORAGE_KINDS)
+def test_round_trip(open_manager, log_workouts, storage):
+    manager = open_manager(storage)
+    log_workouts(manager, DATES)
+    expected = state(manager)
+    manager.close()
+
+    assert state(open_manager(storage)) == expected
+
+
+def test_json_is_the_default(open_manager):
+    assert read_storage_setting(WorkoutManager.SETTINGS_FILE) == "json"
+    assert type(open_manager().storage).__name__ == "JsonStorage"
+
+
+def test_journal_only_appends(open_manager, log_workouts):
+    manager = open_manager("journal")
+    with open(WorkoutManager.DATA_FILE) as f:
+        snapshot = f.read()
+    log_workouts(manager, DATES)
+
+    # nothing reached the snapshot, every change is a line in the journal
+    with open(WorkoutManager.DATA_FILE) as f:
+        assert f.read() == snapshot
+    with open(WorkoutManager.JOURNAL_FILE) as f:
+        records = [json.loads(line) for line in f]
+    assert [record["seq"] for record in records] == list(range(1, len(records) + 1))
+
+
+def test_journal_compaction(open_manager, log_workouts, monkeypatch):
+    monkeypatch.setattr(JournalStorage, "COMPACT_EVERY", 5)
+    manager = open_manager("journal")
+    log_workouts(manager, DATES)
+    manager.storage.writer.flush()
+
+    # the snapshot has what was compacted and the journal only what came after it
+    with open(WorkoutManager.DATA_FILE) as f:
+        snapshot_seq = json.load(f)["journal_seq"]
+    with open(WorkoutManager.JOURNAL_FILE) as f:
+        left = [json.loads(line)["seq"] for line in f]
+    assert snapshot_seq >= JournalStorage.COMPACT_EVERY
+    assert all(seq > snapshot_seq for seq in left)
+    assert snapshot_seq + len(left) == manager.storage.seq
+
+    expected = state(manager)
+    manager.close()
+    assert state(open_manager("journal")) == expected
+
+
+def test_journal_ignores_a_torn_last_line(open_manager, log_workouts):
+    manager = open_manager("journal")
+    log_workouts(manager, DATES[:2])
+    expected = state(manager)
+    manager.close()
+    with open(WorkoutManager.JOURNAL_FILE, "a") as f:
+        f.write('{"op": "add_exer')
+
+    assert state(open_manager("journal")) == expected
+
+
+def test_switching_from_journal_to_json_keeps_the_data(open_manager, log_workouts):
+    manager = open_manager("journal")
+    log_workouts(manager, DATES)
+    expected = state(manager)
+    manager.close()
+
+    migrate("json", "journal")
+    assert not os.path.exists(WorkoutManager.JOURNAL_FILE)
+    assert state(open_manager()) == expected
+
+
+@pytest.mark.parametrize("source, target", list(permutations(STORAGE_KINDS, 2)))
+def test_migrate(open_manager, log_workouts, source, target):
+    manager = open_manager(source)
+    log_workouts(manager, DATES)
+    expected = state(manager)
+    manager.close()
+
+    migrate(target, source)
+    assert read_storage_setting(WorkoutManager.SETTINGS_FILE) == target
+    # the SQLite tracker is computed from the sets, so this also checks it agrees with the one logged workout by workout
+    assert state(open_manager()) == expected
+
+
+def test_sqlite_save_blocks_leaves_the_rows_alone(open_manager, log_workouts):
+    manager = open_manager("sqlite")
+    log_workouts(manager, DATES)
+    rows = manager.storage.conn.execute("SELECT id FROM workouts ORDER BY id").fetchall()
+
+    manager.save_data()
+    assert manager.storage.conn.execute("SELECT id FROM workouts ORDER BY id").fetchall() == rows
+
+
+def test_journal_snapshots_are_written_in_the_background(open_manager, log_workouts):
+    manager = open_manager("journal")
+    log_workouts(manager, DATES)
+    with open(WorkoutManager.TOTAL_DATA_FILE) as f:
+        before = f.read()
+
+    # only a copy is taken on the calling thread, the file is written by the writer
+    manager.storage.compact(manager)
+    with open(WorkoutManager.TOTAL_DATA_FILE) as f:
+        assert f.read() == before
+    manager.storage.writer.flush()
+    with open(WorkoutManager.TOTAL_DATA_FILE) as f:
+        assert json.load(f)["journal_seq"] == manager.storage.seq
+    assert os.path.getsize(WorkoutManager.JOURNAL_FILE) == 0
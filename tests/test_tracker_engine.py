@@ -0,0 +1,54 @@
+from tracker_engine import diff_trackers, rebuild_tracker
+from tracker_series import tracker_to_json
+
+
+# unpadded dates like the app's own "%B %#d, %Y" default, out of order, with repeats of the same day
+DATES = ["June 5, 2025", "June 2, 2025", "June 9, 2025", "June 5, 2025", "May 30, 2025", "06-12-2025", "2025-06-14"]
+
+
+def test_rebuild_matches_logging_workouts(open_manager, log_workouts):
+    manager = open_manager()
+    log_workouts(manager, DATES)
+    log_workouts(manager, DATES[:3], sets={"Squat": [[3, 245], [5, 235.5]], "Deadlift": [[5, 315], [5, 315]]})
+
+    rebuilt = rebuild_tracker(manager.training_blocks, manager.all_exercises)
+    assert diff_trackers(rebuilt, manager.over_time_tracker) == []
+    assert manager.check_tracker() == []
+
+    # the only thing allowed to differ is how the personal best dates are written
+    logged, rebuilt = tracker_to_json(manager.over_time_tracker), tracker_to_json(rebuilt)
+    logged_bests, rebuilt_bests = logged.pop("Personal Bests"), rebuilt.pop("Personal Bests")
+    assert logged == rebuilt
+    assert {name: best[:2] for name, best in logged_bests.items()} == {name: best[:2] for name, best in rebuilt_bests.items()}
+
+
+def test_personal_best_tie_goes_to_the_latest_workout(open_manager, log_workouts):
+    manager = open_manager()
+    log_workouts(manager, ["June 9, 2025", "June 2, 2025"])
+
+    assert manager.over_time_tracker["Personal Bests"]["Squat"] == [3, 245, "June 9, 2025"]
+    assert rebuild_tracker(manager.training_blocks, manager.all_exercises)["Personal Bests"]["Squat"] == [3, 245, "June 09, 2025"]
+    assert manager.check_tracker() == []
+
+
+def test_diff_finds_a_changed_tracker(open_manager, log_workouts):
+    manager = open_manager()
+    log_workouts(manager, DATES)
+    manager.over_time_tracker["Personal Bests"]["Squat"][2] = "June 3, 2025"
+    manager.over_time_tracker["Stats"]["Total Volume"] += 1
+    manager.over_time_tracker["Squat"]["5"].insert(manager.training_blocks[0].workouts[0].day, 1)
+
+    differences = manager.check_tracker()
+    assert len(differences) == 3
+    assert differences[0].startswith("Personal best for Squat")
+
+
+def test_rebuild_tracker_replaces_the_tracker(open_manager, log_workouts):
+    manager = open_manager()
+    log_workouts(manager, DATES)
+    manager.over_time_tracker["Stats"]["Total Rep #"] = 0
+    version = manager.tracker_version
+
+    manager.rebuild_tracker()
+    assert manager.check_tracker() == []
+    assert manager.tracker_version == version + 1
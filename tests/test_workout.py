@@ -0,0 +1,50 @@
+import json
+
+from dates import UNKNOWN_DAY, parse_date
+from workout import Workout
+from workout_manager import WorkoutManager
+
+
+def write_data(blocks, tracker):
+    with open(WorkoutManager.DATA_FILE, "w") as f:
+        json.dump(blocks, f)
+    with open(WorkoutManager.TOTAL_DATA_FILE, "w") as f:
+        json.dump(tracker, f)
+
+
+def test_dates_in_every_saved_format():
+    days = {Workout("Day A", text).day for text in ("June 5, 2025", "June 05, 2025", "06-05-2025", "2025-06-05")}
+    assert days == {parse_date("June 5, 2025")}
+
+
+def test_loading_an_unreadable_date(open_manager, capsys):
+    workouts = [
+        {"date": "June 2, 2025", "template_name": "Day A", "entries": {"Squat": [[5, 225]]}},
+        {"date": "sometime in June", "template_name": "Day A", "entries": {"Squat": [[5, 235]]}},
+    ]
+    write_data(
+        {"all_exercises": ["Squat"], "training_blocks": [{"starting_date": "June 2, 2025", "workouts_per_week": 3, "workouts": workouts, "templates": []}]},
+        {"Squat": {"Volume": [[1125, 1175], ["June 2, 2025", "sometime in June"]]},
+         "Personal Bests": {"Squat": [5, 235, "sometime in June"]},
+         "Stats": {"Total Rep #": 10, "Total Volume": 2300, "Rep # Per Workout": [[5, 5], ["June 2, 2025", "sometime in June"]],
+                   "Volume Per Workout": [[1125, 1175], ["June 2, 2025", "sometime in June"]]}},
+    )
+
+    manager = open_manager()
+    assert "sometime in June" in capsys.readouterr().out
+    block = manager.training_blocks[0]
+    # the workout sorts first and keeps its text, so it's saved back the way it was
+    assert [workout.day for workout in block.workouts] == [UNKNOWN_DAY, parse_date("June 2, 2025")]
+    assert block.workouts[0].date == "sometime in June"
+    assert manager.over_time_tracker["Squat"]["Volume"].days[0] == UNKNOWN_DAY
+
+    # the app keeps working with it
+    workout = Workout("Day A", "June 4, 2025")
+    workout.add_entry({"Squat": [[5, 245]]})
+    manager.add_workout(block, workout)
+    assert manager.over_time_tracker["Personal Bests"]["Squat"] == [5, 245, "June 4, 2025"]
+    manager.close()
+
+    with open(WorkoutManager.DATA_FILE) as f:
+        saved = json.load(f)["training_blocks"][0]["workouts"]
+    assert "sometime in June" in [workout["date"] for workout in saved]
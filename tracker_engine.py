@@ -0,0 +1,204 @@
+import argparse
+from array import array
+import numpy as np
+from dates import format_date, parse_saved_date
+from tracker_series import Series
+from exercise_catalog import catalog
+
+
+def flatten_sets(training_blocks):
+    """Flattens every set of every workout into columns (one numpy array per column).
+
+    Returns a dict with:
+        "workout", "exercise", "reps", "weight"  one entry per set
+        "days"                                   the day number of each workout
+        "blocks"                                 the index of the training block of each workout
+        "templates"                              the template name of each workout (a list)
+        "exercises"                              the exercise name for each exercise index (the catalog ids)
+    Workouts are numbered in block order, then in their order in the block."""
+
+    return flatten_workouts((block_idx, workout) for block_idx, block in enumerate(training_blocks) for workout in block.workouts)
+
+
+def flatten_workouts(numbered_workouts):
+    """flatten_sets() for any (block index, Workout) pairs, e.g. just the workouts logged since the last time."""
+
+    packed_sets = array("d")  # every workout's packed [reps, weight, ...] arrays one after the other
+    group_workout, group_exercise, group_size = [], [], []
+    days = []
+    blocks = []
+    templates = []
+
+    for block_idx, workout in numbered_workouts:
+        workout_idx = len(days)
+        days.append(workout.day)
+        blocks.append(block_idx)
+        templates.append(workout.template_name)
+
+        for exercise_id, packed in workout.sets.items():
+            packed_sets.extend(packed)
+            group_workout.append(workout_idx)
+            group_exercise.append(exercise_id)
+            group_size.append(len(packed) // 2)
+
+    pairs = np.frombuffer(packed_sets, dtype=np.float64).reshape(-1, 2)
+    return {
+        "workout": np.repeat(np.array(group_workout, dtype=np.int64), group_size),
+        "exercise": np.repeat(np.array(group_exercise, dtype=np.int64), group_size),
+        "reps": pairs[:, 0],
+        "weight": pairs[:, 1],
+        "days": np.array(days, dtype=np.int64),
+        "blocks": np.array(blocks, dtype=np.int64),
+        "templates": templates,
+        "exercises": list(catalog.names),
+    }
+
+
+def run_starts(*keys):
+    """Given columns sorted by keys, returns the index where each run of equal keys starts."""
+    changed = np.zeros(len(keys[0]), dtype=bool)
+    if len(changed):
+        changed[0] = True
+    for key in keys:
+        changed[1:] |= key[1:] != key[:-1]
+    return np.flatnonzero(changed)
+
+
+def rebuild_tracker(training_blocks, all_exercises):
+    """Recomputes the whole over time tracker from the workouts in the training blocks.
+
+    It gives the same result as calling add_workout_to_tracker() on every workout in block order,
+    except that personal best dates are written zero padded ("June 05, 2025") whatever way the
+    workout's date was typed."""
+
+    cols = flatten_sets(training_blocks)
+    workout, exercise, reps, weight = cols["workout"], cols["exercise"], cols["reps"], cols["weight"]
+    days, names = cols["days"], cols["exercises"]
+
+    # add_workout_to_tracker() counts volume as int(weight) * int(reps)
+    volume = np.trunc(weight) * np.trunc(reps)
+
+    # series are kept in date order, so for them the workouts are numbered by date instead (block order on the same day)
+    by_day = np.argsort(days, kind="stable")
+    numbered = np.empty_like(by_day)
+    numbered[by_day] = np.arange(len(by_day))
+    dated_workout, dated_days = numbered[workout], days[by_day]
+
+    tracker = {name: {"Volume": Series()} for name in all_exercises}
+    tracker["Personal Bests"] = {name: [0, 0, ""] for name in all_exercises}
+    for exercise_id in np.unique(exercise):
+        tracker.setdefault(names[exercise_id], {"Volume": Series()})
+        tracker["Personal Bests"].setdefault(names[exercise_id], [0, 0, ""])
+
+    # volume of each exercise in each workout
+    order = np.lexsort((dated_workout, exercise))
+    starts = run_starts(exercise[order], dated_workout[order])
+    if len(order):
+        group_volume = np.add.reduceat(volume[order], starts)
+        group_exercise = exercise[order][starts]
+        group_workout = dated_workout[order][starts]
+        for ex_idx, ex_starts in zip(*split_runs(group_exercise)):
+            tracker[names[ex_idx]]["Volume"] = Series(dated_days[group_workout[ex_starts]].tolist(), group_volume[ex_starts].tolist())
+
+    # heaviest weight for each rep count of each exercise in each workout
+    order = np.lexsort((dated_workout, reps, exercise))
+    starts = run_starts(exercise[order], reps[order], dated_workout[order])
+    if len(order):
+        group_weight = np.maximum.reduceat(weight[order], starts)
+        group_exercise = exercise[order][starts]
+        group_reps = reps[order][starts]
+        group_workout = dated_workout[order][starts]
+        for run in np.split(np.arange(len(starts)), run_starts(group_exercise, group_reps)[1:]):
+            first = run[0]
+            tracker[names[group_exercise[first]]][str(int(group_reps[first]))] = Series(dated_days[group_workout[run]].tolist(), group_weight[run].tolist())
+
+    # personal bests: heaviest weight (in whole pounds, like add_workout_to_tracker()), then most reps
+    # at that weight, then the latest workout by date
+    order = np.lexsort((dated_workout, reps, np.trunc(weight), exercise))
+    if len(order):
+        last_of_exercise = np.append(run_starts(exercise[order])[1:], len(order)) - 1
+        for i in order[last_of_exercise]:
+            tracker["Personal Bests"][names[exercise[i]]] = [int(reps[i]), int(weight[i]), format_date(dated_days[dated_workout[i]])]
+
+    # totals and the per workout stats
+    workout_reps = np.bincount(dated_workout, weights=np.trunc(reps), minlength=len(days))
+    workout_volume = np.bincount(dated_workout, weights=volume, minlength=len(days))
+    tracker["Stats"] = {
+        "Total Rep #": int(workout_reps.sum()),
+        "Total Volume": int(workout_volume.sum()),
+        "Rep # Per Workout": Series(dated_days.tolist(), workout_reps.tolist()),
+        "Volume Per Workout": Series(dated_days.tolist(), workout_volume.tolist()),
+    }
+
+    return tracker
+
+
+def split_runs(keys):
+    """For a sorted array, returns each distinct key and the indexes holding it."""
+    starts = run_starts(keys)
+    return keys[starts], np.split(np.arange(len(keys)), starts[1:])
+
+
+def diff_trackers(expected, actual):
+    """Compares two over time trackers and returns a list of the differences as readable lines.
+
+    Series are compared as sorted (date, value) points, so the same workouts added in a
+    different order don't count as a difference."""
+
+    differences = []
+
+    def points(series):
+        return sorted(zip(series.days, series.values))
+
+    def best(entry):
+        # the date is compared as a day, a logged one is saved as it was typed ("June 5, 2025") and a rebuilt one zero padded
+        if entry is None:
+            return None
+        reps, weight, saved_date = entry
+        return reps, weight, parse_saved_date(saved_date) if saved_date else None
+
+    def compare_series(label, a, b):
+        if a is None or b is None:
+            differences.append(f"{label}: only in {'the rebuilt' if b is None else 'the current'} tracker")
+        elif points(a) != points(b):
+            differences.append(f"{label}: {len(a)} points rebuilt, {len(b)} points in the current tracker differ")
+
+    for key in sorted(set(expected) | set(actual)):
+        if key == "Personal Bests":
+            for name in sorted(set(expected[key]) | set(actual.get(key, {}))):
+                a, b = expected[key].get(name), actual.get(key, {}).get(name)
+                if best(a) != best(b):
+                    differences.append(f"Personal best for {name}: rebuilt {a}, current {b}")
+        elif key == "Stats":
+            for name in sorted(set(expected[key]) | set(actual.get(key, {}))):
+                a, b = expected[key].get(name), actual.get(key, {}).get(name)
+                if isinstance(a, Series) or isinstance(b, Series):
+                    compare_series(f"Stats {name}", a, b)
+                elif a != b:
+                    differences.append(f"Stats {name}: rebuilt {a}, current {b}")
+        else:
+            a, b = expected.get(key, {}), actual.get(key, {})
+            for rep in sorted(set(a) | set(b)):
+                compare_series(f"{key} {rep}", a.get(rep), b.get(rep))
+
+    return differences
+
+
+
+if __name__ == "__main__":
+    from workout_manager import WorkoutManager
+
+    parser = argparse.ArgumentParser(description="Check the over time tracker against the workout history.")
+    parser.add_argument("--fix", action="store_true", help="replace the tracker with the one rebuilt from the workouts")
+    args = parser.parse_args()
+
+    manager = WorkoutManager()
+    differences = manager.check_tracker()
+    for line in differences:
+        print(line)
+    print(f"{len(differences)} differences found.")
+
+    if args.fix and differences:
+        manager.rebuild_tracker()
+        print("Tracker rebuilt.")
+    manager.close()
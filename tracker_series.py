@@ -0,0 +1,135 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+from dates import parse_saved_date, format_date
+from workout import whole_number
+
+
+class Series():
+    """One series of the over time tracker, e.g. the heaviest weight done for 5 reps on each workout date.
+
+    The JSON file keeps a series as [[values], [date strings]]. In memory it is two compact arrays
+    instead: the day number of each date (date.toordinal()) and the value as a float.
+
+    The points are kept in date order (points on the same day in the order they were added), even
+    when a workout is entered with an earlier date, so a date range is found with a binary search."""
+
+    __slots__ = ("days", "values")
+
+    def __init__(self, days=(), values=()):
+        self.days = array("i", days)
+        self.values = array("d", values)
+
+
+    def __len__(self):
+        return len(self.days)
+
+
+    def append(self, day, value):
+        """Adds a value for the given day number, which can't be before the last day of the series (see insert)."""
+        self.days.append(day)
+        self.values.append(value)
+
+
+    def insert(self, day, value):
+        """Adds a value for the given day number where it belongs by date, after any points already on that day."""
+        # nearly always the newest date, which is just an append
+        if not self.days or day >= self.days[-1]:
+            self.append(day, value)
+        else:
+            i = bisect_right(self.days, day)
+            self.days.insert(i, day)
+            self.values.insert(i, value)
+
+
+    def index_range(self, start_day, end_day):
+        """The (start, end) slice of the points from start_day to end_day (both included)."""
+        return bisect_left(self.days, start_day), bisect_right(self.days, end_day)
+
+
+    def between(self, start_day, end_day):
+        """Returns the part of the series from start_day to end_day (both included) as a new Series."""
+        start, end = self.index_range(start_day, end_day)
+        part = Series()
+        part.days = self.days[start:end]
+        part.values = self.values[start:end]
+        return part
+
+
+    def copy(self):
+        part = Series()
+        part.days = self.days[:]
+        part.values = self.values[:]
+        return part
+
+
+    def is_sorted(self):
+        days = self.days
+        return all(days[i] <= days[i + 1] for i in range(len(days) - 1))
+
+
+    def sort(self):
+        """Puts the points in date order (keeping the order of points on the same day), for series
+        saved before they were kept in order."""
+        if not self.is_sorted():
+            order = sorted(range(len(self.days)), key=self.days.__getitem__)
+            self.days = array("i", [self.days[i] for i in order])
+            self.values = array("d", [self.values[i] for i in order])
+        return self
+
+
+    def dates(self):
+        """The dates of the series as datetime.date objects (for plotting)."""
+        return [date.fromordinal(day) for day in self.days]
+
+
+    def to_json(self):
+        """Converts the series back to the [[values], [date strings]] layout of the JSON file."""
+        return [[whole_number(value) for value in self.values],
+                [format_date(day) for day in self.days]]
+
+
+    @classmethod
+    def from_json(cls, data):
+        values, dates = data
+        # older files can have back dated workouts at the end
+        return cls([parse_saved_date(text) for text in dates], values).sort()
+
+
+
+def tracker_from_json(data):
+    """Converts the over time tracker loaded from JSON so every series is a Series."""
+    tracker = {}
+    for key, entry in data.items():
+        if key == "Personal Bests":
+            tracker[key] = entry
+        elif key == "Stats":
+            tracker[key] = {name: Series.from_json(value) if isinstance(value, list) else value for name, value in entry.items()}
+        else:
+            tracker[key] = {rep: Series.from_json(value) for rep, value in entry.items()}
+    return tracker
+
+
+def copy_tracker(tracker):
+    """A copy of the tracker that later changes don't reach, for saving it on another thread.
+    Only the arrays are copied (nothing is formatted), so it's quick even for a long history."""
+    copy = {}
+    for key, entry in tracker.items():
+        if key == "Personal Bests":
+            copy[key] = {name: list(best) for name, best in entry.items()}
+        else:
+            copy[key] = {name: value.copy() if isinstance(value, Series) else value for name, value in entry.items()}
+    return copy
+
+
+def tracker_to_json(tracker):
+    """The opposite of tracker_from_json(), for saving the tracker."""
+    data = {}
+    for key, entry in tracker.items():
+        if key == "Personal Bests":
+            data[key] = {name: list(best) for name, best in entry.items()}  # copied, they change in place
+        elif key == "Stats":
+            data[key] = {name: value.to_json() if isinstance(value, Series) else value for name, value in entry.items()}
+        else:
+            data[key] = {rep: series.to_json() for rep, series in entry.items()}
+    return data
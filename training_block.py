@@ -1,8 +1,15 @@
+import pickle
+from bisect import bisect_left, bisect_right, insort
 from workout import Workout
 from workout_templates import WorkoutTemplate
 
 
+def workout_day(workout):
+    return workout.day
+
+
 class TrainingBlock():
+    __slots__ = ("starting_date", "workouts_per_week", "_workouts", "templates", "workout_loader", "workout_data")
 
 
     # each training "block" will have a starting date attributed to it
@@ -10,19 +17,67 @@ class TrainingBlock():
         # the starting date needs to be in "Month-day-year" format
         self.starting_date = starting_date
         self.workouts_per_week = workouts_per_week
-        self.workouts = []
+        self._workouts = []
         self.templates = [] # This will be a list of workout templates. ie, "Leg Day", "Upper Body", etc.
 
+        # a function returning the workouts, set when they haven't been loaded yet.
+        # It only gets called the first time the workouts are actually needed
+        self.workout_loader = None
+        # the saved (dict) form of the workouts while they haven't been loaded, see from_dict() and saved_workouts()
+        self.workout_data = None
+
+
+    # the workouts are kept in date order (workouts on the same day in the order they were added),
+    # so a workout entered with an earlier date still lands in the right place
+    @property
+    def workouts(self):
+        if self.workout_loader is not None:
+            # saved files can be out of order from before, sorting an already sorted list is quick
+            self._workouts = sorted(self.workout_loader(), key=workout_day)
+            self.workout_loader = None
+            self.workout_data = None
+        return self._workouts
+
+    @workouts.setter
+    def workouts(self, workouts):
+        self._workouts = sorted(workouts, key=workout_day)
+        self.workout_loader = None
+        self.workout_data = None
+
 
     # each workout will have a date it was done and a dictionary that will come from the gui code. 
     # This dictionary will have all the exersices, sets, reps, and weight for the workout.
     def add_workout(self, workout):
         """Allows you to add a new workout to the choosen TrainingBlock"""
 
-        self.workouts.append(workout)
+        insort(self.workouts, workout, key=workout_day)
         # workout.print_workout()
 
 
+    def workouts_between(self, start_day, end_day):
+        """The workouts from start_day to end_day (day numbers, both included), found with a binary search."""
+        workouts = self.workouts
+        return workouts[bisect_left(workouts, start_day, key=workout_day):bisect_right(workouts, end_day, key=workout_day)]
+
+
+    def day_range(self):
+        """(first day, last day) of the block's workouts as day numbers, or None if it has none yet."""
+        workouts = self.workouts
+        return (workouts[0].day, workouts[-1].day) if workouts else None
+
+
+    def copy(self):
+        """A copy for saving on another thread, later changes to this block don't reach it. Logged
+        workouts never change, so only the lists holding them are copied, and workouts that were
+        never loaded are left in their saved form."""
+        block = TrainingBlock(self.starting_date, self.workouts_per_week)
+        block.workout_data = self.workout_data
+        if self.workout_data is None:
+            block._workouts = list(self.workouts)
+        block.templates = [WorkoutTemplate(template.name, list(template.exercises)) for template in self.templates]
+        return block
+
+
     def add_template(self, name, exercises):
         self.templates.append(WorkoutTemplate(name, exercises))
 
@@ -33,7 +88,8 @@ class TrainingBlock():
         return {
             "starting_date" : self.starting_date,
             "workouts_per_week" : self.workouts_per_week,
-            "workouts" : [workout.to_dict() for workout in self.workouts],
+            # workouts that were never loaded are saved exactly as they were read
+            "workouts" : self.saved_workouts() if self.workout_data is not None else [workout.to_dict() for workout in self.workouts],
             "templates" : [template.to_dict() for template in self.templates]
         }
     
@@ -44,10 +100,20 @@ class TrainingBlock():
 
         block = cls(data["starting_date"], data["workouts_per_week"])
         # block.workouts = [Workout(**workout) for workout in data["workouts"]]
-        block.workouts = [Workout.from_dict(workout) for workout in data["workouts"]]
+        # the Workout objects are only made the first time the block's workouts are used
+        block.workout_data = data["workouts"]
+        block.workout_loader = lambda: [Workout.from_dict(workout) for workout in block.saved_workouts()]
         block.templates = [WorkoutTemplate(**template) for template in data["templates"]]
 
         return block
+
+
+    def saved_workouts(self):
+        """The saved (dict) form of the workouts that haven't been loaded yet. Coming from the
+        snapshot cache they're still pickled (bytes), they're only unpickled once they're needed."""
+        if isinstance(self.workout_data, bytes):
+            self.workout_data = pickle.loads(self.workout_data)
+        return self.workout_data
     
 
     def print_block(self):
@@ -1,10 +1,48 @@
+from array import array
 from datetime import date
+from exercise_catalog import catalog
+from dates import parse_saved_date
+
 
 class Workout:
-    def __init__(self, template_name):
+    # __slots__ keeps each workout small, there can be thousands of them in memory
+    __slots__ = ("template_name", "_date", "day", "sets")
+
+    def __init__(self, template_name, workout_date=None):
         self.template_name = template_name
-        self.date = str(date.today().strftime("%B %#d, %Y"))
-        self.entries = {}  # {exercise_name: [[reps, weight], ...]}
+        self.date = workout_date or str(date.today().strftime("%B %#d, %Y"))
+        # {exercise id: array of reps and weights packed one after the other [reps, weight, reps, weight, ...]}
+        self.sets = {}
+
+    @property
+    def date(self):
+        return self._date
+
+    @date.setter
+    def date(self, text):
+        # the day number (date.toordinal()) is kept next to the text so nothing has to parse it again,
+        # the text itself is kept as it was so a date that can't be read is still saved back unchanged
+        self._date = text
+        self.day = parse_saved_date(text)
+
+    @property
+    def entries(self):
+        """The sets of the workout as {exercise_name: [[reps, weight], ...]}.
+        This is built fresh on each access, assign to it (or use add_entry) to change the sets."""
+        entries = {}
+        for exercise_id, packed in self.sets.items():
+            entries[catalog.name_of(exercise_id)] = [[int(packed[i]), whole_number(packed[i + 1])] for i in range(0, len(packed), 2)]
+        return entries
+
+    @entries.setter
+    def entries(self, entries):
+        self.sets = {}
+        for exercise_name, sets in entries.items():
+            packed = array("d")
+            for reps, weight in sets:
+                packed.append(float(reps))
+                packed.append(float(weight))
+            self.sets[catalog.id_of(exercise_name)] = packed
 
     def add_entry(self, entries):
         self.entries = entries
@@ -30,7 +68,11 @@ class Workout:
 
     @classmethod
     def from_dict(cls, data):
-        obj = cls(data["template_name"])
-        obj.date = data["date"]
+        obj = cls(data["template_name"], data["date"])
         obj.entries = data["entries"]
         return obj
+
+
+def whole_number(value):
+    """Weights are stored as floats, this gives back an int when there is no fraction (100.0 -> 100)."""
+    return int(value) if value.is_integer() else value
@@ -1,4 +1,4 @@
-from workoutapp_gui import *
+from workoutapp_gui import WorkoutAppGUI
 from workout_manager import WorkoutManager
 
 
@@ -8,6 +8,7 @@ def run_workout_app():
     manager = WorkoutManager()
     app = WorkoutAppGUI(manager)
     app.mainloop()
+    manager.close()  # let any background snapshot finish writing before exiting
 
 
 
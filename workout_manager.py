@@ -1,6 +1,12 @@
-import json
 import os
 from training_block import TrainingBlock
+from workout import Workout
+from storage import JsonStorage, JournalStorage, SqliteStorage, read_storage_setting
+from tracker_series import Series
+from exercise_index import ExerciseIndex
+from rep_max import RepMaxIndex
+from dates import parse_saved_date
+from events import EventBus, ExerciseAdded, BlockCreated, BlockRemoved, TemplateAdded, WorkoutLogged, TrackerRebuilt
 import bisect
 import shutil
 import sys
@@ -16,6 +22,11 @@ def resource_path(relative_path):
     return os.path.join(base_path, relative_path)
 
 
+def not_before(day, saved_date):
+    """True if the day number isn't before the saved date string (an empty date is before everything)."""
+    return not saved_date or day >= parse_saved_date(saved_date)
+
+
 def get_user_data_path(filename: str) -> str:
 
     """Cross-platform user-specific app data folder"""
@@ -49,79 +60,168 @@ class WorkoutManager():
     # so that the data files are in the same directory as the executable
     DATA_FILE = setup_default_json("training_block_data.json")
     TOTAL_DATA_FILE = setup_default_json("training_data.json")
+    # every change gets appended here, the two files above are only rewritten when it is compacted
+    JOURNAL_FILE = get_user_data_path("training_journal.jsonl")
+    SQLITE_FILE = get_user_data_path("training_data.sqlite3")
+    # remembers which of the storages above is in use, it is changed by running "python storage.py <storage>"
+    SETTINGS_FILE = get_user_data_path("settings.json")
 
 
-    def __init__(self):
-        """Manages multiple TrainingBlocks and handles data persistence."""
+    def __init__(self, storage=None):
+        """Manages multiple TrainingBlocks and handles data persistence.
+        storage is "json", "journal" or "sqlite", by default the one saved in the settings file."""
         # print("Initializing WorkoutManager...")
 
         self.all_exercises = []
+        # for searching all_exercises by name in the exercise lists, kept up to date with it
+        self.exercise_index = ExerciseIndex()
 
         self.over_time_tracker = {}
         self.training_blocks = []
+        # goes up every time the tracker changes, so screens know when what they drew is out of date
+        self.tracker_version = 0
+        # goes up on every change to any of the data (blocks, templates, workouts, exercises or the tracker)
+        self.data_version = 0
+        # tells the screens and caches what changed after every change, see events.py
+        self.events = EventBus()
+        # rep max tables of the exercises looked at so far, see rep_max_index()
+        self.rep_maxes = RepMaxIndex()
+
+        self.storage = self.make_storage(storage or read_storage_setting(self.SETTINGS_FILE))
         self.load_data()
+
+
+    def make_storage(self, kind):
+        """Creates the storage backend with the given name."""
+
+        if kind == "json":
+            return JsonStorage(self.DATA_FILE, self.TOTAL_DATA_FILE)
+        elif kind == "journal":
+            return JournalStorage(self.DATA_FILE, self.TOTAL_DATA_FILE, self.JOURNAL_FILE)
+        elif kind == "sqlite":
+            return SqliteStorage(self.SQLITE_FILE)
+        raise ValueError(f"Unknown storage '{kind}'.")
         
 
     def add_training_block(self, starting_date, workouts_per_week):
         """Adds a new TrainingBlock to the system."""
 
-        new_block = TrainingBlock(starting_date, workouts_per_week)
-        self.training_blocks.append(new_block)
-
-        self.save_data()
+        self.commit({"op": "add_block", "starting_date": starting_date, "workouts_per_week": workouts_per_week})
 
     def add_template_to_block(self, block, name, exercises):
         """Adds a new workout template to a specific TrainingBlock."""
 
-        block.add_template(name, exercises)
-        self.save_data()
+        self.commit({"op": "add_template", "block": self.training_blocks.index(block), "name": name, "exercises": exercises})
 
 
-    def add_exercise(self, exercise_name):
-        """Adds a new exercise to the all_exercises list."""
+    def add_workout(self, block, workout):
+        """Adds a finished workout to a TrainingBlock and its sets to the tracker."""
+
+        self.commit({"op": "add_workout", "block": self.training_blocks.index(block), "workout": workout.to_dict()})
 
-        if exercise_name not in self.all_exercises:
-            bisect.insort(self.all_exercises, exercise_name) # this adds it in alphabetical order!
 
-            # adds the exercise to the tracking system
-            self.over_time_tracker[exercise_name] = {"Volume" : [[], []]}
-            # adds a new entry in the personal bests dictionary for the new exercise
-            self.over_time_tracker["Personal Bests"][exercise_name] = [0, 0, ""]
-            self.save_tracker_data()
+    def remove_last_training_block(self):
+        """Removes the most recently added TrainingBlock (used when creating a block is cancelled)."""
 
+        self.commit({"op": "remove_block", "block": len(self.training_blocks) - 1})
 
+
+    def add_exercise(self, exercise_name):
+        """Adds a new exercise to the all_exercises list."""
+
+        if exercise_name not in self.all_exercises:
+            self.commit({"op": "add_exercise", "name": exercise_name})
             # print(f"Exercise '{exercise_name}' added.")
         else:
             print(f"Exercise '{exercise_name}' already exists.")
 
 
+    def commit(self, record):
+        """Applies a change to the data in memory and then hands it to the storage to persist."""
+
+        event = self.apply(record)
+        self.storage.record(self, record)
+        # subscribers only hear about it once it's saved
+        self.events.publish(event)
+
+
+    def apply(self, record, blocks=True, tracker=True):
+        """Applies one change record in memory and returns the event describing it (see events.py).
+        blocks/tracker choose which half of the change to apply, the journal uses this when only
+        one of the files already has it. Every change adds exactly one to data_version."""
+
+        op = record["op"]
+        event = None
+        self.data_version += 1
+        if tracker and op in ("add_exercise", "add_workout"):
+            self.tracker_version += 1
+
+        if op == "add_exercise":
+            exercise_name = record["name"]
+            if blocks and exercise_name not in self.all_exercises:
+                bisect.insort(self.all_exercises, exercise_name) # this adds it in alphabetical order!
+                self.exercise_index.add(exercise_name)
+
+            if tracker and exercise_name not in self.over_time_tracker:
+                # adds the exercise to the tracking system
+                self.over_time_tracker[exercise_name] = {"Volume" : Series()}
+                # adds a new entry in the personal bests dictionary for the new exercise
+                self.over_time_tracker["Personal Bests"][exercise_name] = [0, 0, ""]
+            event = ExerciseAdded(exercise_name)
+
+        elif op == "add_block":
+            if blocks:
+                self.training_blocks.append(TrainingBlock(record["starting_date"], record["workouts_per_week"]))
+                event = BlockCreated(len(self.training_blocks) - 1, self.training_blocks[-1])
+
+        elif op == "add_template":
+            if blocks:
+                block = self.training_blocks[record["block"]]
+                block.add_template(record["name"], record["exercises"])
+                event = TemplateAdded(record["block"], block, record["name"], record["exercises"])
+
+        elif op == "add_workout":
+            workout = Workout.from_dict(record["workout"])
+            if blocks:
+                self.training_blocks[record["block"]].add_workout(workout)
+                event = WorkoutLogged(record["block"], self.training_blocks[record["block"]], workout)
+            if tracker:
+                self.add_workout_to_tracker(workout) # adds the information in the workout to the tracker to keep track of stats...
+
+        elif op == "remove_block":
+            if blocks:
+                event = BlockRemoved(record["block"], self.training_blocks.pop(record["block"]))
+
+        return event
+
+
     def save_data(self):
         """Saves all training blocks to JSON."""
         
         # print("Saving data...")
-        data_to_save = {
-        "all_exercises": self.all_exercises,  # e.g., a list stored in your class
-        "training_blocks": [block.to_dict() for block in self.training_blocks]
-        }
-        with open(self.DATA_FILE, "w") as f:
-            json.dump(data_to_save, f, indent=4)
+        self.storage.save_blocks(self)
 
     def save_tracker_data(self):
-        with open(self.TOTAL_DATA_FILE, "w") as f:
-            json.dump(self.over_time_tracker, f, indent=4)
+        self.storage.save_tracker(self)
+
+
+    def close(self):
+        """Lets the storage finish anything it is still writing. Call before the app exits."""
+        self.storage.close()
 
     
     def add_workout_to_tracker(self, workout):
+        """Adds the sets of a workout to the over time tracker (in memory only, add_workout persists it)."""
         workout_date = workout.date
+        workout_day = workout.day # the series in the tracker store dates as day numbers
 
         total_reps = 0
         total_volume = 0
 
         # iterating over all the exercises in the workout
         for name, entry in workout.entries.items():
-            # list of the best sets of each particular rep range reached
-            reps = [] 
-            weights = []
+            # the best set of each particular rep range reached {rep #: heaviest weight}, in the order they were first done
+            best_weights = {}
 
             all_reps = 0
             all_weight = 0
@@ -133,48 +233,44 @@ class WorkoutManager():
                 all_reps += int(rep)
                 all_weight += int(weight) * int(rep)
 
-                # if we've already seen this rep number, then compare the weights
-                if rep in reps:
-                    idx = reps.index(rep)
-                    # if the new weigth is more than the already found weight, replace
-                    if weights[idx] < weight:
-                        weights[idx] = weight
-                # if we have not seen this rep number yet, add to lists
-                else:
-                    reps.append(rep)
-                    weights.append(weight)
+                # keep the heaviest weight for this rep number
+                if rep not in best_weights or best_weights[rep] < weight:
+                    best_weights[rep] = weight
 
 
             # now to add this new weight info for each found rep count to the tracker
-            cur_exercise = self.over_time_tracker[name] # dict of current exercise {rep # : [[weight], [corrisponding date]], ...}
-            cur_exercise['Volume'][0].append(all_weight) # add the volume for this exercise
-            cur_exercise['Volume'][1].append(str(workout_date)) # add the date
+            cur_exercise = self.over_time_tracker[name] # dict of current exercise {rep # : Series of weight per date, ...}
+            cur_exercise['Volume'].insert(workout_day, all_weight) # add the volume for this exercise on this date
 
             # iterating over each rep range
-            for i, rep in enumerate(reps):
-                # see if rep number has been added to dict yet
-                rep = str(rep) # convert to string for dictionary key
+            for rep, weight in best_weights.items():
+                rep_key = str(rep) # convert to string for dictionary key
 
-                if rep in cur_exercise.keys():
-                    rep_running_list = cur_exercise[rep]
+                if rep_key not in cur_exercise:
+                    cur_exercise[rep_key] = Series()
 
-                    rep_running_list[0].append(weights[i]) # add the weight for that rep number
-                    rep_running_list[1].append(str(workout_date)) # add the date when that was repped
-                # if not seen rep number yet
-                else:
-                    cur_exercise[rep] = [[weights[i]], [str(workout_date)]]
+                cur_exercise[rep_key].insert(workout_day, weight) # add the weight for that rep number and the date it was repped
+
+            # the rep max table only needs updating if it was made already, otherwise it's made from the series above when needed
+            if self.rep_maxes.loaded(name):
+                for rep, weight in best_weights.items():
+                    self.rep_maxes.add_set(name, int(rep), weight, workout_day)
 
 
             # sets the new heaviest weight lifted and for the number of reps to the dictionary
-            heaviest_set = int(max(weights))
+            # (the most reps done with the heaviest weight, weights count in whole pounds like everywhere in the tracker)
+            heaviest_reps, heaviest_weight = max(best_weights.items(), key=lambda item: (int(item[1]), int(item[0])))
+            heaviest_set = int(heaviest_weight)
             if heaviest_set > self.over_time_tracker["Personal Bests"][name][1]: # because the lists is [rep #, weight]
                 self.over_time_tracker["Personal Bests"][name][1] = heaviest_set
-                self.over_time_tracker["Personal Bests"][name][0] = reps[weights.index(max(weights))]
+                self.over_time_tracker["Personal Bests"][name][0] = heaviest_reps
                 self.over_time_tracker["Personal Bests"][name][2] = str(workout_date) # also add the date of the personal best
             # this is if the heaviest set matches the current personal best, but the reps are more than the previous best
-            elif heaviest_set == self.over_time_tracker["Personal Bests"][name][1] and reps[weights.index(max(weights))] >= self.over_time_tracker["Personal Bests"][name][0]:
+            # (or the same reps done again, unless this workout was back dated to before the personal best)
+            elif heaviest_set == self.over_time_tracker["Personal Bests"][name][1] and (heaviest_reps > self.over_time_tracker["Personal Bests"][name][0] or
+                    (heaviest_reps == self.over_time_tracker["Personal Bests"][name][0] and not_before(workout_day, self.over_time_tracker["Personal Bests"][name][2]))):
                 self.over_time_tracker["Personal Bests"][name][1] = heaviest_set
-                self.over_time_tracker["Personal Bests"][name][0] = reps[weights.index(max(weights))]
+                self.over_time_tracker["Personal Bests"][name][0] = heaviest_reps
                 self.over_time_tracker["Personal Bests"][name][2] = str(workout_date) # also add the date of the personal best
 
 
@@ -185,40 +281,46 @@ class WorkoutManager():
             total_volume += all_weight
 
         # adding the number of reps and volume for the workout to the over time tracker
-        self.over_time_tracker["Stats"]["Rep # Per Workout"][0].append(total_reps)
-        self.over_time_tracker["Stats"]["Rep # Per Workout"][1].append(workout_date)
-        self.over_time_tracker["Stats"]["Volume Per Workout"][0].append(total_volume)
-        self.over_time_tracker["Stats"]["Volume Per Workout"][1].append(workout_date)
+        # (insert keeps the series in date order when the workout was entered with an earlier date)
+        self.over_time_tracker["Stats"]["Rep # Per Workout"].insert(workout_day, total_reps)
+        self.over_time_tracker["Stats"]["Volume Per Workout"].insert(workout_day, total_volume)
+
+
+    def rebuild_tracker(self):
+        """Recomputes the whole over time tracker from the workouts in every training block and saves it."""
+        from tracker_engine import rebuild_tracker # numpy is only needed here, so it isn't loaded at startup
 
+        self.over_time_tracker = rebuild_tracker(self.training_blocks, self.all_exercises)
+        self.tracker_version += 1
+        self.data_version += 1
+        self.rep_maxes.clear()
         self.save_tracker_data()
+        self.events.publish(TrackerRebuilt())
+
+
+    def check_tracker(self):
+        """Returns the differences (as readable lines) between the tracker and one rebuilt from the workouts."""
+        from tracker_engine import rebuild_tracker, diff_trackers
+
+        return diff_trackers(rebuild_tracker(self.training_blocks, self.all_exercises), self.over_time_tracker)
+
+
+    def rep_max_index(self, exercise):
+        """Returns the RepMaxIndex with the exercise's table ready to be asked, e.g.
+        manager.rep_max_index("Squat").best_at("Squat", 5) or .e1rm("Squat")."""
+        if not self.rep_maxes.loaded(exercise):
+            self.rep_maxes.load(exercise, self.over_time_tracker.get(exercise, {}))
+        return self.rep_maxes
 
 
     def load_data(self):
-        """Loads training blocks from JSON if available."""
+        """Loads training blocks and the tracker from storage if available."""
         # print("Loading data...")
-        # Check if the file exists and is not empty
-        if os.path.exists(self.DATA_FILE):
-            with open(self.DATA_FILE, "r") as f:
-                try:
-                    # print("Loading data from file...")
-                    data = json.load(f)   # load the data from the file                    
-                    self.all_exercises = data.get("all_exercises", [])
-                    self.training_blocks = [TrainingBlock.from_dict(block) for block in data.get("training_blocks", [])]
-                except json.JSONDecodeError:
-                    return []    
-
-        # loading in the data for the over time tracker
-        if os.path.exists(self.TOTAL_DATA_FILE):
-            with open(self.TOTAL_DATA_FILE, "r") as f:
-                try:
-                    # print("Loading data for tracker...")
-                    data = json.load(f)   # load the data from the file
-                    self.over_time_tracker = data
-                    # print(self.over_time_tracker.keys())
-                except json.JSONDecodeError:
-                    return []
+        self.storage.load(self)
+        self.exercise_index = ExerciseIndex(self.all_exercises)
     
 
+
     def print_training_blocks(self):
         for idx, block in enumerate(self.training_blocks):
             print(f"\nTraining Block {idx + 1}:")
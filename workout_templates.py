@@ -1,4 +1,6 @@
 class WorkoutTemplate:
+    __slots__ = ("name", "exercises")
+
     def __init__(self, name, exercises):
         self.name = name
         self.exercises = exercises
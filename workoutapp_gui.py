@@ -1,13 +1,16 @@
 import customtkinter as ctk
-from workout import Workout
-from PIL import Image, ImageTk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from datetime import datetime
-import matplotlib.dates as mdates
+import tkinter as tk
+from PIL import Image
+from collections import OrderedDict
+from image_pyramid import ImagePyramid
+from workout import Workout, whole_number
+from dates import parse_date, format_date
+from datetime import date
+from events import ExerciseAdded, BlockCreated, BlockRemoved, WorkoutLogged, TrackerRebuilt
 import sys
 import os
 import re
+import time
 
 
 
@@ -31,17 +34,13 @@ class WorkoutAppGUI(ctk.CTk):
         self.title("Workout Tracker")
 
 
-        # This checks if it is using mac, if so, you have to use png for macOS or linux
+        # Windows uses the .ico, macOS and linux have to use the png
         if sys.platform == "win32":
             self.iconbitmap(resource_path("barbell.ico"))
-        elif sys.platform == "darwin":
-            icon_img = Image.open(resource_path("barbell-4.png"))
-            self.icon_image = ImageTk.PhotoImage(icon_img)
+        else:
+            # Tk reads png itself, no need to go through PIL for the icon
+            self.icon_image = tk.PhotoImage(file=resource_path("barbell-4.png"))
             self.iconphoto(False, self.icon_image)  # type: ignore
-        elif sys.platform == "linux":
-            icon_img = Image.open(resource_path("barbell-4.png"))
-            icon_image = ImageTk.PhotoImage(icon_img)
-            self.iconphoto(False, icon_image)   # type: ignore
             
         # set the geometry
         self.geometry("1100x700+200+100")  # width x height + x_offset + y_offset
@@ -57,19 +56,19 @@ class WorkoutAppGUI(ctk.CTk):
 
         # ctk.set_appearance_mode("dark")
 
-        # Create frames and keep references
+        # screens are made the first time they're shown (see show_frame) and kept after that
         self.frames = {}
-        for F in (NewBlockScreen, AddWorkoutScreen, HomeScreen, SeeStatesScreen, PastWorkoutsScreen, AllExercisesScreen):
-            frame = F(self.container, self, self.manager)
-            self.frames[F] = frame
-            frame.grid(row=0, column=0, sticky="nsew")
 
         # Show the first screen
         self.show_frame(HomeScreen)
 
     def show_frame(self, frame_class):
-        '''Raise the selected frame to the top.'''
-        frame = self.frames[frame_class]
+        '''Raise the selected frame to the top, making it first if it hasn't been shown yet.'''
+        frame = self.frames.get(frame_class)
+        if frame is None:
+            frame = frame_class(self.container, self, self.manager)
+            self.frames[frame_class] = frame
+            frame.grid(row=0, column=0, sticky="nsew")
 
         # Call reset if available
         # for the NewWorkoutScreen, this first deletes any possible already exsisting frames and then creates the StartDate_NumberWorkouts frame
@@ -92,6 +91,11 @@ class WorkoutAppGUI(ctk.CTk):
 class HomeScreen(ctk.CTkFrame):
     """Frame for the home screen with options to create a new block, add a workout, or view stats."""
 
+    # while the window is being dragged the picture is redrawn with a quick filter at most every PREVIEW_INTERVAL ms,
+    # and properly once no resize has happened for SETTLE_DELAY ms
+    PREVIEW_INTERVAL = 50
+    SETTLE_DELAY = 150
+
     def __init__(self, parent, controller, manager):
         super().__init__(parent, fg_color="#474747")
         self.controller = controller
@@ -101,14 +105,15 @@ class HomeScreen(ctk.CTkFrame):
         self.grid_columnconfigure((0, 1), weight=1)
         # self.grid_propagate(False)  # Prevents the frame from resizing to fit its contents
 
-        # loading the image for the home screen
-        # self.original_image = Image.open('gym_pic.jpg')  # Make sure this image exists in the same directory
-        self.original_image = Image.open(resource_path("gym_pic.jpg")) 
-        self.ctk_image = ctk.CTkImage(light_image=self.original_image, dark_image=self.original_image, size=(500, 700))  # Resize as needed
-    
-        # Display the image in a label
-        self.image_label = ctk.CTkLabel(self, image=self.ctk_image, text="")  # text="" hides label text
+        # the label for the image is placed now, the picture itself is loaded once the window is up (see load_image)
+        self.pyramid = None
+        self.shown_size = None  # (width, height) of the picture on screen
+        self.shown_preview = False  # if it's only the quick preview
+        self.last_preview = 0
+        self.settle_job = None
+        self.image_label = ctk.CTkLabel(self, text="", width=500, height=700)  # text="" hides label text
         self.image_label.grid(row=0, column=0, rowspan=6, sticky="nsw")
+        self.after_idle(self.load_image)
 
 
         self.label = ctk.CTkLabel(self, text="Welcome To Your Personal\nWorkout Tracker!", font=ctk.CTkFont(size=40, weight='bold'), text_color="#0C0C0C")
@@ -136,22 +141,53 @@ class HomeScreen(ctk.CTkFrame):
 
         self.bind("<Configure>", self.resize_image)
 
-    def resize_image(self, event):
+    def load_image(self):
+        # self.original_image = Image.open('gym_pic.jpg')  # Make sure this image exists in the same directory
+        original_image = Image.open(resource_path("gym_pic.jpg"))
+        # the resized pictures are cached as the CTkImage the label shows
+        self.pyramid = ImagePyramid(original_image, convert=self.make_ctk_image)
+        self.ctk_image = self.pyramid.get((500, 700))
+        self.image_label.configure(image=self.ctk_image)
+        self.settle_image()
+
+    def make_ctk_image(self, image):
+        # CTkImage sizes get multiplied by the window scaling, this makes it come out at exactly the image's pixels
+        scaling = ctk.ScalingTracker.get_widget_scaling(self)
+        return ctk.CTkImage(light_image=image, dark_image=image, size=(image.width / scaling, image.height / scaling))
+
+    def label_size(self):
         width = self.image_label.winfo_width()
         height = self.image_label.winfo_height()
+        return (width, height) if width > 1 and height > 1 else None
+
+    def resize_image(self, event=None):
+        """Called for every <Configure>, which fires dozens of times a second while the window is dragged."""
 
-        if width > 1 and height > 1:
-            # Resize the original image
-            resized_image = self.original_image.resize((width, height), Image.LANCZOS)
+        size = self.label_size()
+        if self.pyramid is None or size is None or (size == self.shown_size and not self.shown_preview):
+            return
+
+        now = time.monotonic() * 1000
+        if now - self.last_preview >= self.PREVIEW_INTERVAL:
+            self.last_preview = now
+            self.show_image(size, preview=True)
 
-            # Create a NEW CTkImage from the resized image
-            new_ctk_image = ctk.CTkImage(light_image=resized_image, dark_image=resized_image)
+        # the proper picture waits until the resizing stops
+        if self.settle_job is not None:
+            self.after_cancel(self.settle_job)
+        self.settle_job = self.after(self.SETTLE_DELAY, self.settle_image)
 
-            # Update the image on the label
-            self.image_label.configure(image=new_ctk_image)
+    def settle_image(self):
+        self.settle_job = None
+        size = self.label_size()
+        if size is not None:
+            self.show_image(size, preview=False)
 
-            # Store a reference so it doesn't get garbage collected
-            self.ctk_image = new_ctk_image
+    def show_image(self, size, preview):
+        # Store a reference so it doesn't get garbage collected
+        self.ctk_image = self.pyramid.get(size, fast=preview)
+        self.image_label.configure(image=self.ctk_image)
+        self.shown_size, self.shown_preview = size, preview
 
 
 
@@ -196,8 +232,7 @@ class NewBlockScreen(ctk.CTkFrame):
     def exit_to_home(self):
         """Exits to the home screen without saving the block."""
         if self.already_created:
-            self.manager.training_blocks.pop(-1)  # Remove the last block added
-            self.manager.save_data()  # Save the changes to the data file
+            self.manager.remove_last_training_block()  # Remove the last block added and save the change
 
             self.already_created = False # Reset this so we know the block is no longer created
 
@@ -275,6 +310,157 @@ class NewBlockScreen(ctk.CTkFrame):
 
 
 
+class VirtualList(ctk.CTkFrame):
+    """A scrolling list that only has widgets for the rows that fit on screen.
+
+    Instead of one widget per item, just enough cells are made to fill the rows that can be seen
+    and scrolling shows different items in those same cells, so a list of thousands of exercises
+    costs the same as a list of twenty. make_cell(master) makes one cell widget and
+    fill_cell(cell, item) shows an item in it."""
+
+    def __init__(self, master, make_cell, fill_cell, row_height, columns=1, **kwargs):
+        super().__init__(master, **kwargs)
+        self.make_cell = make_cell
+        self.fill_cell = fill_cell
+        self.row_height = row_height
+        self.columns = columns
+
+        self.items = []
+        self.first_row = 0     # the row of items at the top
+        self.visible_rows = 0  # how many rows fit, worked out when the list gets its size
+        self.cells = []
+
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        # the cells go in here, its size comes from the screen's layout and not from the cells in it
+        self.body = ctk.CTkFrame(self, fg_color="transparent")
+        self.body.grid(row=0, column=0, sticky="nsew")
+        self.body.grid_propagate(False)
+        self.body.grid_columnconfigure(tuple(range(columns)), weight=1)
+        self.body.bind("<Configure>", self.on_resize)
+        self.bind_scrolling(self.body)
+
+        self.scrollbar = ctk.CTkScrollbar(self, command=self.yview)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+
+
+    def set_items(self, items):
+        self.items = items
+        self.first_row = 0
+        self.redraw()
+
+
+    def row_count(self):
+        return -(-len(self.items) // self.columns)
+
+
+    def on_resize(self, event):
+        visible_rows = max(1, event.height // self.row_height)
+        if visible_rows == self.visible_rows:
+            return
+        self.visible_rows = visible_rows
+
+        # make more cells if the list got taller (cells are never destroyed, just hidden)
+        while len(self.cells) < visible_rows * self.columns:
+            i = len(self.cells)
+            cell = self.make_cell(self.body)
+            cell.grid(row=i // self.columns, column=i % self.columns, padx=10, pady=2, sticky="w")
+            self.bind_scrolling(cell)
+            self.cells.append(cell)
+        self.redraw()
+
+
+    def redraw(self):
+        """Fills the cells with the items of the rows being looked at."""
+
+        rows = self.row_count()
+        self.first_row = max(0, min(self.first_row, rows - self.visible_rows))
+        start = self.first_row * self.columns
+        shown = self.visible_rows * self.columns
+
+        for i, cell in enumerate(self.cells):
+            if i < shown and start + i < len(self.items):
+                self.fill_cell(cell, self.items[start + i])
+                cell.grid()
+            else:
+                cell.grid_remove()
+
+        if rows <= self.visible_rows:
+            self.scrollbar.set(0, 1)
+        else:
+            self.scrollbar.set(self.first_row / rows, (self.first_row + self.visible_rows) / rows)
+
+
+    def yview(self, *args):
+        """Scrolls the same way the scrollbar asks a Text widget to: ("moveto", fraction) or ("scroll", n, "units"/"pages")."""
+        if args[0] == "moveto":
+            self.first_row = round(float(args[1]) * self.row_count())
+        elif args[0] == "scroll":
+            self.first_row += int(args[1]) * (self.visible_rows if args[2] == "pages" else 1)
+        self.redraw()
+
+
+    def bind_scrolling(self, widget):
+        widget.bind("<MouseWheel>", self.on_mouse_wheel)
+        widget.bind("<Button-4>", self.on_mouse_wheel)  # linux
+        widget.bind("<Button-5>", self.on_mouse_wheel)
+
+
+    def on_mouse_wheel(self, event):
+        if sys.platform.startswith("win"):
+            delta = -int(event.delta / 40)
+        elif sys.platform == "darwin":
+            delta = -event.delta
+        else:
+            delta = -1 if event.num == 4 else 1
+        self.yview("scroll", delta, "units")
+
+
+
+class ExerciseList(ctk.CTkFrame):
+    """A search box over a VirtualList of the exercises. The list shows what manager.exercise_index
+    finds for the search (every exercise when it's empty)."""
+
+    def __init__(self, master, index, make_cell, fill_cell, row_height, columns=1, font_size=15, **kwargs):
+        super().__init__(master, **kwargs)
+        self.index = index
+        self.search_job = None
+
+        self.grid_rowconfigure(1, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self.search = ctk.CTkEntry(self, placeholder_text="Search exercises...", font=ctk.CTkFont(size=font_size), border_width=2, fg_color="#90938F", text_color="#0C0C0C", border_color="#2C2C2C", placeholder_text_color="#2C2C2C")
+        self.search.grid(row=0, column=0, padx=10, pady=(10, 0), sticky="ew")
+        self.search.bind("<KeyRelease>", self.schedule_search)
+
+        self.list = VirtualList(self, make_cell, fill_cell, row_height, columns, fg_color="transparent")
+        self.list.grid(row=1, column=0, padx=5, pady=5, sticky="nsew")
+
+        self.refresh()
+
+
+    def schedule_search(self, event=None):
+        # searches once the user stops typing for a moment instead of on every key
+        if self.search_job is not None:
+            self.after_cancel(self.search_job)
+        self.search_job = self.after(150, self.refresh)
+
+
+    def refresh(self):
+        """Shows the exercises matching the search again (call after exercises are added)."""
+        self.search_job = None
+        self.list.set_items(self.index.search(self.search.get()))
+
+
+    def clear(self):
+        """Empties the search box and shows every exercise again."""
+        self.search.delete(0, "end")
+        self.refresh()
+
+
+
+
 class BlocksWorkouts(ctk.CTkFrame):
     """This block is called as many times as there are workout templates needed for the training block.
         It will have the workout of the week number, an entry box for the workout name, and a scrollable frame
@@ -310,29 +496,12 @@ class BlocksWorkouts(ctk.CTkFrame):
         # for the exercises label and scrollable frame fro users to select exercises
         self.label = ctk.CTkLabel(self, text="Exercises:", text_color="#0C0C0C", font=ctk.CTkFont(size=30, weight="bold"))
         self.label.grid(row=3, column=0, padx=10, pady=(10, 0), sticky="wes")
-        self.exercise_scrollframe = ctk.CTkScrollableFrame(self, border_width=2, fg_color="#90938F", border_color="#2C2C2C")
-        self.exercise_scrollframe.grid(row=4, column=0, padx=10, pady=(10, 10), sticky="nsew")
-        
-        # self.exercise_scrollframe.grid_columnconfigure(0, weight=1)  # Empty space on the left
-        # self.exercise_scrollframe.grid_columnconfigure(1, weight=0)  # First checkbox column
-        # self.exercise_scrollframe.grid_columnconfigure(2, weight=0)  # Second checkbox column
-        # self.exercise_scrollframe.grid_columnconfigure(3, weight=1)  # Empty space on the right
-
-
-        # Create checkboxes for each exercise in the workout manager (all of them)
-        self.selected_exercises = {}  # Dictionary to hold the selected exercises
-        # double sided checkboxes for the exercises
-        for i, exercise in enumerate(self.poss_exercises):
-            var = ctk.BooleanVar()
-            checkbox = ctk.CTkCheckBox(self.exercise_scrollframe, text=exercise, font=ctk.CTkFont(size=15, weight="bold"), variable=var, text_color="#0C0C0C", border_color="#2C2C2C", hover_color="#298031", fg_color="#298031")
-
-            # Calculate the row and column for two columns
-            row = i // 2
-            column = i % 2
-            # column = 1 if i % 2 == 0 else 2  # Use columns 1 and 2 for centered layout
-
-            checkbox.grid(row=row, column=column, padx=10, pady=2, sticky="w")
-            self.selected_exercises[exercise] = var
+        # Checkboxes for the exercises in the workout manager (all of them), in two columns.
+        # Only the ones on screen exist, so which exercises are checked is kept in a set
+        self.selected_exercises = set()
+        self.exercise_list = ExerciseList(self, manager.exercise_index, self.make_checkbox, self.fill_checkbox, row_height=30, columns=2,
+                                          border_width=2, fg_color="#90938F", border_color="#2C2C2C")
+        self.exercise_list.grid(row=4, column=0, padx=10, pady=(10, 10), sticky="nsew")
 
 
         if last:
@@ -343,9 +512,26 @@ class BlocksWorkouts(ctk.CTkFrame):
             self.button.grid(row=5, column=0, padx=10, pady=(10, 10))
 
 
+    def make_checkbox(self, master):
+        return ctk.CTkCheckBox(master, font=ctk.CTkFont(size=15, weight="bold"), text_color="#0C0C0C", border_color="#2C2C2C", hover_color="#298031", fg_color="#298031")
+
+    def fill_checkbox(self, checkbox, exercise):
+        checkbox.configure(text=exercise, command=lambda: self.toggle_exercise(checkbox, exercise))
+        if exercise in self.selected_exercises:
+            checkbox.select()
+        else:
+            checkbox.deselect()
+
+    def toggle_exercise(self, checkbox, exercise):
+        if checkbox.get():
+            self.selected_exercises.add(exercise)
+        else:
+            self.selected_exercises.discard(exercise)
+
+
     def get_entries(self):
         """Returns the name and the exercises of the template to make."""
-        selected = [exercise for exercise, var in self.selected_exercises.items() if var.get()]
+        selected = [exercise for exercise in self.poss_exercises if exercise in self.selected_exercises]
 
         if self.on_submit_callback:
             self.on_submit_callback(self.workout_name.get(), selected)
@@ -433,6 +619,27 @@ class StartDate_NumberWorkouts(ctk.CTkFrame):
 
 
 
+class WidgetPool():
+    """Keeps widgets that aren't being used so they can be handed out again, instead of destroying
+    them and making new ones every time. make() makes a widget when there are none left."""
+
+    def __init__(self, make):
+        self.make = make
+        self.free = []
+
+
+    def take(self):
+        return self.free.pop() if self.free else self.make()
+
+
+    def give_back(self, widgets):
+        for widget in widgets:
+            widget.grid_remove()
+            self.free.append(widget)
+
+
+
+
 class AddWorkoutScreen(ctk.CTkFrame):
     """Frame for adding a workout to an existing training block."""
 
@@ -456,11 +663,16 @@ class AddWorkoutScreen(ctk.CTkFrame):
 
         self.block_template = None # this will be created in the reset method
 
+        # the exercise frames are kept and filled in again for the next workout, one pool for each layout
+        self.frames = []
+        self.exercise_pool = WidgetPool(lambda: Exercises(self))
+        self.new_exercise_pool = WidgetPool(lambda: Exercises(self, new_exercise=True))
+
         self.exit_button = ctk.CTkButton(self, corner_radius=0, fg_color="#FF1E1E", hover_color="#CB1919", text="Exit to Home Screen (will not save Workout)", command=lambda: self.exit_to_home(), font=ctk.CTkFont(size=10), border_color="#000000", border_width=2, text_color="#0C0C0C")
         self.exit_button.grid(row=1, column=0, padx=(0, 10), pady=(0, 0), sticky='w')
 
-        # self.diff_date = ctk.CTkEntry(self, placeholder_text="Enter Workout Date, If Not Today (MM-DD-YYYY)", fg_color="#90938F", border_color="#000000", border_width=2, font=ctk.CTkFont(size=20), placeholder_text_color="#0C0C0C", justify="center", text_color="#0C0C0C")
-        # self.diff_date.grid(row=1, column=1, padx=10, pady=(0, 10), sticky="ew")
+        self.diff_date = ctk.CTkEntry(self, placeholder_text="Enter Workout Date, If Not Today (MM-DD-YYYY)", fg_color="#90938F", border_color="#000000", border_width=2, font=ctk.CTkFont(size=20), placeholder_text_color="#0C0C0C", justify="center", text_color="#0C0C0C")
+        self.diff_date.grid(row=1, column=1, padx=10, pady=(0, 10), sticky="ew")
         
 
     def exit_to_home(self):
@@ -470,19 +682,16 @@ class AddWorkoutScreen(ctk.CTkFrame):
 
     
     def reset(self):
-        # Destroy any existing workout frames
-        if hasattr(self, "frames"):
-            for frame in self.frames:
-                frame.destroy()
-        self.frames = []
+        # put away the exercise frames of the last workout
+        self.release_frames()
         self.curr_frame_idx = 0
         self.current_block = None
 
         if self.block_template:
             self.block_template.destroy()
 
-        self.diff_date = ctk.CTkEntry(self, placeholder_text="Enter Workout Date, If Not Today (MM-DD-YYYY)", fg_color="#90938F", border_color="#000000", border_width=2, font=ctk.CTkFont(size=20), placeholder_text_color="#0C0C0C", justify="center", text_color="#0C0C0C")
-        self.diff_date.grid(row=1, column=1, padx=10, pady=(0, 10), sticky="ew")
+        # the date entry is kept, just emptied
+        self.diff_date.delete(0, "end")
 
         # this creates the StartDate_NumberWorkouts frame after the reset so that it is blank 
         # This calls the create_block method when the button is clicked to return the start date and number of workouts
@@ -490,29 +699,29 @@ class AddWorkoutScreen(ctk.CTkFrame):
         self.block_template.grid(row=0, column=0, padx=10, pady=(10, 10), sticky="wsne")
 
 
+    def release_frames(self):
+        """Gives the exercise frames back to their pools for the next workout."""
+        self.exercise_pool.give_back([frame for frame in self.frames if not frame.new_exercise])
+        self.new_exercise_pool.give_back([frame for frame in self.frames if frame.new_exercise])
+        self.frames = []
+
+
     def create_workout(self, block, template):
         # print(f"creating workout now with block starting on {block.starting_date} with template {template.name}")
-        # Destroy existing exercise frames if any
-        if hasattr(self, "frames"):
-            for frame in self.frames:
-                frame.destroy()
+        # the frames of the last workout get reused
+        self.release_frames()
 
         # initializing the workout object
         self.workout = Workout(template_name=template.name)
         self.block = block
 
-        self.frames = []
         self.curr_frame_idx = 0
 
         for i in range(len(template.exercises)):
-            if i == len(template.exercises) - 1:
-
-                exercise_frame = Exercises(self, template.exercises[i], last=True, on_submit_callback=self.add_entry)
-                exercise_frame.grid(row=0, column=1, padx=10, pady=(10, 10), sticky="wsne")
-                # if is last workout
-            else:
-                exercise_frame = Exercises(self, template.exercises[i], last=False, on_submit_callback=self.add_entry)
-                exercise_frame.grid(row=0, column=1, padx=10, pady=(10, 10), sticky="wsne")
+            # if is last workout
+            exercise_frame = self.exercise_pool.take()
+            exercise_frame.set_exercise(template.exercises[i], last=i == len(template.exercises) - 1, on_submit_callback=self.add_entry)
+            exercise_frame.grid(row=0, column=1, padx=10, pady=(10, 10), sticky="wsne")
 
             self.frames.append(exercise_frame)
         
@@ -528,7 +737,8 @@ class AddWorkoutScreen(ctk.CTkFrame):
         # print(want_new_exercise)
 
         if want_new_exercise:
-            new_exercise_frame = Exercises(self, "None", last=True, on_submit_callback=self.add_entry, new_exercise=True)
+            new_exercise_frame = self.new_exercise_pool.take()
+            new_exercise_frame.set_exercise("None", last=True, on_submit_callback=self.add_entry)
             new_exercise_frame.grid(row=0, column=1, padx=10, pady=(10, 10), sticky="wsne")
             self.frames.append(new_exercise_frame)
 
@@ -545,21 +755,16 @@ class AddWorkoutScreen(ctk.CTkFrame):
             if self.diff_date.get() != "":
                 # if the user entered a different date, then we will use that date instead of today
                 
-                # Convert to datetime object
-                date_obj = datetime.strptime(self.diff_date.get(), "%m-%d-%Y")
-
                 # Format as "Month day, year"
-                formatted_date = date_obj.strftime("%B %d, %Y")
-                self.workout.date = formatted_date
+                self.workout.date = format_date(parse_date(self.diff_date.get()))
 
                 # self.diff_date.setvar("")  # Reset the date entry field
                 self.diff_date.delete(0, 'end')  # Clear the date entry field
 
             self.workout.add_entry(self.workout_entries) # adding the entries list to the workout object
-            self.block.add_workout(self.workout)
 
-            self.manager.save_data()
-            self.manager.add_workout_to_tracker(self.workout) # adds the information in the wokrout to the tracker to keep track of stats...
+            # adds the workout to the block and its information to the tracker to keep track of stats...
+            self.manager.add_workout(self.block, self.workout)
 
         self.show_next_frame()
 
@@ -582,21 +787,24 @@ class AddWorkoutScreen(ctk.CTkFrame):
 class Exercises(ctk.CTkFrame):
     """ There is going to be one of these for each of the exercises in the template. They
     will be stacked and shown one at a time. This is where the user will enter the number 
-    of sets, reps, and weight for each of the exercises they did that day!"""
+    of sets, reps, and weight for each of the exercises they did that day!
+
+    The frames are pooled by AddWorkoutScreen, so the widgets are made once here and
+    set_exercise() fills the frame in for an exercise of the next workout."""
 
-    def __init__(self, parent, exercise_name, last=False, on_submit_callback=None, new_exercise=False):
+    def __init__(self, parent, new_exercise=False):
         super().__init__(parent)
-        self.on_submit_callback = on_submit_callback
-        self.exercise_name = exercise_name
-        self.last = last
-        self.want_new_exercise = False
+        self.new_exercise = new_exercise
+        self.on_submit_callback = None
+        self.exercise_name = None
+        self.last = False
 
         self.configure(fg_color="#3E505F", border_color="#000000", border_width=2.5)  # Set the background color of the frame   7E8D9C    C0C0C0
 
-        self.num_sets_val = None
-        self.num_reps = []
-        self.weight = []
-        self.did_skip = False
+        # the rows for each set, made when first needed and kept: [(reps label, reps entry, weight label, weight entry), ...]
+        self.set_rows = []
+        self.reps_entries = []
+        self.weight_entries = []
 
         if not new_exercise:
             self.grid_rowconfigure(0, weight=0) # name of exercise
@@ -609,8 +817,8 @@ class Exercises(ctk.CTkFrame):
 
             self.grid_propagate(False)
 
-            self.label = ctk.CTkLabel(self, text_color="#0C0C0C", text=f"{exercise_name}", font=ctk.CTkFont(size=25, weight="bold"))
-            self.label.grid(row=0, column=0, padx=10, pady=(10, 0), sticky="ew")
+            self.name_label = ctk.CTkLabel(self, text_color="#0C0C0C", text="", font=ctk.CTkFont(size=25, weight="bold"))
+            self.name_label.grid(row=0, column=0, padx=10, pady=(10, 0), sticky="ew")
 
             self.skip_var = ctk.BooleanVar()
             self.skip_exercise_check = ctk.CTkCheckBox(self, text="Skip Exercise", variable=self.skip_var, text_color="#0C0C0C", font=ctk.CTkFont(size=25), fg_color="#298031", hover_color="#1F6326")
@@ -624,15 +832,11 @@ class Exercises(ctk.CTkFrame):
             self.num_sets_button = ctk.CTkButton(self, text="Enter Set Number", command=self.get_reps_weight, text_color="#0C0C0C", font=ctk.CTkFont(size=25, weight="bold"), fg_color="#298031", hover_color="#1F6326", border_width=2, border_color="#2C2C2C", corner_radius=20)
             self.num_sets_button.grid(row=2, column=0, columnspan=2, padx=10, pady=10)
 
-            if last:
-                self.submit_button = ctk.CTkButton(self, text="Submit Workout", command=self.submit_exercise, text_color="#0C0C0C", font=ctk.CTkFont(size=20, weight="bold"), fg_color="#298031", hover_color="#1F6326", border_width=2, border_color="#2C2C2C", corner_radius=20)
-                self.submit_button.grid(row=4, column=0, pady=10)
-                # this is for when you want to add another exercise that is not usually in the template workout
-                self.submit_button = ctk.CTkButton(self, text="Enter & Add New Exercise", command=self.create_new_exercise, text_color="#0C0C0C", font=ctk.CTkFont(size=20, weight="bold"), fg_color="#298031", hover_color="#1F6326", border_width=2, border_color="#2C2C2C", corner_radius=20)
-                self.submit_button.grid(row=4, column=1, pady=10)
-            else:
-                self.submit_button = ctk.CTkButton(self, text="Enter Exercise", command=self.submit_exercise, text_color="#0C0C0C", font=ctk.CTkFont(size=20, weight="bold"), fg_color="#298031", hover_color="#1F6326", border_width=2, border_color="#2C2C2C", corner_radius=20)
-                self.submit_button.grid(row=4, column=0, columnspan=2, pady=10)
+            # the last exercise gets the two buttons, the others the "Enter Exercise" one, see set_exercise()
+            self.submit_button = ctk.CTkButton(self, text="Submit Workout", command=self.submit_exercise, text_color="#0C0C0C", font=ctk.CTkFont(size=20, weight="bold"), fg_color="#298031", hover_color="#1F6326", border_width=2, border_color="#2C2C2C", corner_radius=20)
+            # this is for when you want to add another exercise that is not usually in the template workout
+            self.add_exercise_button = ctk.CTkButton(self, text="Enter & Add New Exercise", command=self.create_new_exercise, text_color="#0C0C0C", font=ctk.CTkFont(size=20, weight="bold"), fg_color="#298031", hover_color="#1F6326", border_width=2, border_color="#2C2C2C", corner_radius=20)
+            self.enter_button = ctk.CTkButton(self, text="Enter Exercise", command=self.submit_exercise, text_color="#0C0C0C", font=ctk.CTkFont(size=20, weight="bold"), fg_color="#298031", hover_color="#1F6326", border_width=2, border_color="#2C2C2C", corner_radius=20)
         
         else: # this is a different configuration of the exercise frame so that the user can enter a new exercise
             self.grid_rowconfigure(0, weight=1) # picking exercise
@@ -645,21 +849,16 @@ class Exercises(ctk.CTkFrame):
             self.grid_propagate(False)
 
             self.skip_var = ctk.BooleanVar(value=False) # because the object needs this attribute for some functions
-            self.new_exercise = ctk.StringVar(value=None)
+            self.new_exercise_var = ctk.StringVar(value=None)
 
             # first row
             self.label = ctk.CTkLabel(self, text=f"Select Exercise: ", font=ctk.CTkFont(size=25, weight="bold"), text_color="#0C0C0C")
             self.label.grid(row=0, column=0, padx=10, pady=(10, 0), sticky="ew")
 
-            self.exercise_scrollable = ctk.CTkScrollableFrame(self, height=50, border_width=2, fg_color="#90938F", border_color="#2C2C2C")
-            self.exercise_scrollable.grid(row=0, column=1, padx=10, pady=(10, 0), sticky="ew")
-
-            # populate exercise scrollable
-            all_exercises = parent.manager.all_exercises
-            for i in range(len(all_exercises)):
-                self.exercise_button = ctk.CTkRadioButton(self.exercise_scrollable, text=f"{all_exercises[i]}", variable=self.new_exercise, value=all_exercises[i],
-                                         command=lambda e=all_exercises[i]: self.add_new_exercise(e), font=ctk.CTkFont(size=15), text_color="#0C0C0C", fg_color="#298031", hover_color="#1F6326", border_color="#2C2C2C")
-                self.exercise_button.grid(row=i, column=0, padx=5, pady=5, sticky='ew')
+            # the exercises to pick from, with a search box
+            self.exercise_scrollable = ExerciseList(self, parent.manager.exercise_index, self.make_exercise_button, self.fill_exercise_button, row_height=34,
+                                                    height=150, border_width=2, fg_color="#90938F", border_color="#2C2C2C")
+            self.exercise_scrollable.grid(row=0, column=1, padx=10, pady=(10, 0), sticky="nsew")
 
             # second row
             self.label = ctk.CTkLabel(self, text="Number of sets   =", text_color="#0C0C0C", font=ctk.CTkFont(size=20, weight="bold"))
@@ -677,8 +876,48 @@ class Exercises(ctk.CTkFrame):
             self.submit_button = ctk.CTkButton(self, text="Submit Workout", command=self.submit_exercise, text_color="#0C0C0C", font=ctk.CTkFont(size=20, weight="bold"), fg_color="#298031", hover_color="#1F6326", border_width=2, border_color="#2C2C2C", corner_radius=20)
             self.submit_button.grid(row=4, column=0, pady=10)
             # this is for when you want to add another exercise that is not usually in the template workout
-            self.submit_button = ctk.CTkButton(self, text="Enter & Add New Exercise", command=self.create_new_exercise, text_color="#0C0C0C", font=ctk.CTkFont(size=20, weight="bold"), fg_color="#298031", hover_color="#1F6326", border_width=2, border_color="#2C2C2C", corner_radius=20)
-            self.submit_button.grid(row=4, column=1, pady=10)
+            self.add_exercise_button = ctk.CTkButton(self, text="Enter & Add New Exercise", command=self.create_new_exercise, text_color="#0C0C0C", font=ctk.CTkFont(size=20, weight="bold"), fg_color="#298031", hover_color="#1F6326", border_width=2, border_color="#2C2C2C", corner_radius=20)
+            self.add_exercise_button.grid(row=4, column=1, pady=10)
+
+        # fourth row, the reps and weight of each set (shown once the number of sets is entered)
+        self.reps_scroll = ctk.CTkScrollableFrame(self, border_width=2, fg_color="#90938F", border_color="#2C2C2C")
+        self.weight_scroll = ctk.CTkScrollableFrame(self, border_width=2, fg_color="#90938F", border_color="#2C2C2C")
+
+
+    def set_exercise(self, exercise_name, last=False, on_submit_callback=None):
+        """Fills the frame in for an exercise of a new workout, clearing whatever was entered last time."""
+
+        self.on_submit_callback = on_submit_callback
+        self.exercise_name = exercise_name
+        self.last = last
+        self.want_new_exercise = False
+
+        self.num_sets_val = None
+        self.did_skip = False
+
+        self.skip_var.set(False)
+        self.num_sets.delete(0, "end")
+        self.reps_scroll.grid_remove()
+        self.weight_scroll.grid_remove()
+        for _, reps_entry, _, weight_entry in self.set_rows:
+            reps_entry.delete(0, "end")
+            weight_entry.delete(0, "end")
+        self.reps_entries = []
+        self.weight_entries = []
+
+        if self.new_exercise:
+            self.new_exercise_var.set("")
+            self.exercise_scrollable.clear()  # also picks up exercises added since it was last shown
+        else:
+            self.name_label.configure(text=f"{exercise_name}")
+            if last:
+                self.enter_button.grid_remove()
+                self.submit_button.grid(row=4, column=0, pady=10)
+                self.add_exercise_button.grid(row=4, column=1, pady=10)
+            else:
+                self.submit_button.grid_remove()
+                self.add_exercise_button.grid_remove()
+                self.enter_button.grid(row=4, column=0, columnspan=2, pady=10)
 
 
     def submit_exercise(self):
@@ -709,18 +948,19 @@ class Exercises(ctk.CTkFrame):
     def add_new_exercise(self, exercise):
         """To get the name of the Exercise from the radio button scrollable thing..."""
         self.exercise_name = exercise
+
+
+    def make_exercise_button(self, master):
+        return ctk.CTkRadioButton(master, variable=self.new_exercise_var, font=ctk.CTkFont(size=15), text_color="#0C0C0C", fg_color="#298031", hover_color="#1F6326", border_color="#2C2C2C")
+
+    def fill_exercise_button(self, button, exercise):
+        button.configure(text=exercise, value=exercise, command=lambda: self.add_new_exercise(exercise))
         
 
         
 
     def get_reps_weight(self):
 
-        if hasattr(self, "reps_entries"):
-            for widget in self.reps_scroll.winfo_children():
-                widget.destroy()
-            for widget in self.weight_scroll.winfo_children():
-                widget.destroy()
-
         # Get number of sets
         try:
             self.num_sets_val = int(self.num_sets.get())
@@ -728,32 +968,48 @@ class Exercises(ctk.CTkFrame):
             print("Invalid number of sets.")
             return
 
-        self.reps_scroll = ctk.CTkScrollableFrame(self, border_width=2, fg_color="#90938F", border_color="#2C2C2C")
         self.reps_scroll.grid(row=3, column=0, padx=10, pady=10, sticky='ew')
-
-        self.weight_scroll = ctk.CTkScrollableFrame(self, border_width=2, fg_color="#90938F", border_color="#2C2C2C")
         self.weight_scroll.grid(row=3, column=1, padx=10, pady=10, sticky='ew')
 
-        self.reps_entries = []
-        self.weight_entries = []
+        # the rows of earlier set counts are reused and only the missing ones are made
+        while len(self.set_rows) < self.num_sets_val:
+            self.set_rows.append(self.make_set_row(len(self.set_rows)))
+
+        for i, (reps_label, reps_entry, weight_label, weight_entry) in enumerate(self.set_rows):
+            if i < self.num_sets_val:
+                reps_label.grid()
+                reps_entry.grid()
+                weight_label.grid()
+                weight_entry.grid()
+            else:
+                reps_label.grid_remove()
+                reps_entry.grid_remove()
+                weight_label.grid_remove()
+                weight_entry.grid_remove()
+                # so a row shown again later starts out empty
+                reps_entry.delete(0, "end")
+                weight_entry.delete(0, "end")
 
+        self.reps_entries = [row[1] for row in self.set_rows[:self.num_sets_val]]
+        self.weight_entries = [row[3] for row in self.set_rows[:self.num_sets_val]]
 
-        for i in range(int(self.num_sets_val)):
-            # reps
-            reps_label = ctk.CTkLabel(self.reps_scroll, text=f"Set {i+1} Reps:", font=ctk.CTkFont(size=25), text_color="#0C0C0C")
-            reps_label.grid(row=i, column=0, padx=5, pady=5, sticky='e')
 
-            reps_entry = ctk.CTkEntry(self.reps_scroll, width=60, font=ctk.CTkFont(size=25), border_width=2, fg_color="#90938F", text_color="#0C0C0C", border_color="#2C2C2C", justify="center")
-            reps_entry.grid(row=i, column=1, pady=5, sticky='w')
-            self.reps_entries.append(reps_entry)
+    def make_set_row(self, i):
+        # reps
+        reps_label = ctk.CTkLabel(self.reps_scroll, text=f"Set {i+1} Reps:", font=ctk.CTkFont(size=25), text_color="#0C0C0C")
+        reps_label.grid(row=i, column=0, padx=5, pady=5, sticky='e')
 
-            # Weight
-            weight_label = ctk.CTkLabel(self.weight_scroll, text=f"Set {i+1} Weight:", font=ctk.CTkFont(size=25), text_color="#0C0C0C")
-            weight_label.grid(row=i, column=0, padx=5, pady=5, sticky='e')
+        reps_entry = ctk.CTkEntry(self.reps_scroll, width=60, font=ctk.CTkFont(size=25), border_width=2, fg_color="#90938F", text_color="#0C0C0C", border_color="#2C2C2C", justify="center")
+        reps_entry.grid(row=i, column=1, pady=5, sticky='w')
 
-            weight_entry = ctk.CTkEntry(self.weight_scroll, width=60, font=ctk.CTkFont(size=25), border_width=2, fg_color="#90938F", text_color="#0C0C0C", border_color="#2C2C2C", justify="center")
-            weight_entry.grid(row=i, column=1, padx=(5, 50), pady=5, sticky='w')
-            self.weight_entries.append(weight_entry)
+        # Weight
+        weight_label = ctk.CTkLabel(self.weight_scroll, text=f"Set {i+1} Weight:", font=ctk.CTkFont(size=25), text_color="#0C0C0C")
+        weight_label.grid(row=i, column=0, padx=5, pady=5, sticky='e')
+
+        weight_entry = ctk.CTkEntry(self.weight_scroll, width=60, font=ctk.CTkFont(size=25), border_width=2, fg_color="#90938F", text_color="#0C0C0C", border_color="#2C2C2C", justify="center")
+        weight_entry.grid(row=i, column=1, padx=(5, 50), pady=5, sticky='w')
+
+        return reps_label, reps_entry, weight_label, weight_entry
 
     def collect_data(self):
         reps_list = [int(entry.get()) for entry in self.reps_entries]
@@ -858,18 +1114,89 @@ class PickBlock_PickTemplate(ctk.CTkFrame):
 
 
 
+class ChartSlots():
+    """The labels the stats screen shows chart images in. They are kept and reused for the next
+    exercise instead of being destroyed and made again every time."""
+
+    def __init__(self, master):
+        self.master = master
+        self.labels = []
+
+
+    def show(self, charts):
+        """Lays out one label per chart (making more if needed) and hides the labels left over."""
+
+        for i, chart in enumerate(charts):
+            if i == len(self.labels):
+                self.labels.append(ctk.CTkLabel(self.master, text="", width=600, height=410, font=ctk.CTkFont(size=20), text_color="#0C0C0C"))
+            label = self.labels[i]
+            label.configure(image=None, text="Loading graph...")
+
+            if chart["wide"]:
+                label.grid(row=i, column=0, columnspan=2, padx=10, pady=10, sticky="nsew")
+            else:
+                # Double-column logic
+                label.grid(row=i // 2, column=i % 2, columnspan=1, padx=10, pady=10, sticky="nsew")
+
+        self.hide(start=len(charts))
+
+
+    def set_image(self, index, image):
+        label = self.labels[index]
+        label.configure(image=ctk.CTkImage(light_image=image, dark_image=image, size=image.size), text="")
+
+
+    def hide(self, start=0):
+        for label in self.labels[start:]:
+            label.grid_remove()
+
+
+    def destroy(self):
+        for label in self.labels:
+            label.destroy()
+        self.labels = []
+
+
+
+
 class SeeStatesScreen(ctk.CTkFrame):
     """Frame for viewing stats of the training blocks."""
 
+    REP_MAX_COLUMNS = 8  # rep counts shown in the rep max table, fewest reps first
+    # the date ranges the graphs can show, {name: days back from today or None}, see window_days()
+    WINDOWS = {"All Dates": None, "Last 90 Days": 90, "Last Year": 365, "This Block": None}
+    # (exercise, date range) pairs whose charts and images are kept, a few exercises' worth
+    CHART_CACHE_SIZE = 3 * len(WINDOWS)
+
     def __init__(self, parent, controller, manager):
         super().__init__(parent, fg_color="#474747")
         self.controller = controller
         self.manager = manager
 
+        # the prepared charts of the exercises looked at last, {(exercise, tracker version, window days): [chart, ...]},
+        # least recently used first
+        self.render_cache = OrderedDict()
+        # the images drawn for them, {(exercise, tracker version, window days): [image or None if not drawn yet, ...]},
+        # always the same keys as render_cache (see get_charts())
+        self.image_cache = OrderedDict()
+        self.shown_key = None  # the (exercise, tracker version, window days) on screen right now
+        self.poll_scheduled = False
+        self.chart_slots = None
+
+        # the widgets are made the first time the screen is shown, after that only the parts the
+        # data changes made out of date ("exercises", "totals") are updated, see reset()
+        self.built = False
+        self.stale = set()
+        self.exercise_buttons = {}  # {exercise: its radio button}
+        manager.events.subscribe(self.data_changed, ExerciseAdded, WorkoutLogged, TrackerRebuilt, batched=True)
+
+        # the graphs are drawn on a background thread, see show_exercise_data()
+        # matplotlib is only imported here, when the stats screen is first opened, it takes a while to load
+        from chart_renderer import ChartRenderer
+        self.renderer = ChartRenderer()
+
 
     def initialize_setup(self):
-        self.fig = None
-        self.canvas = None
 
         self.grid_rowconfigure(0, weight=0)
         self.grid_rowconfigure(1, weight=1)
@@ -883,9 +1210,9 @@ class SeeStatesScreen(ctk.CTkFrame):
         self.label = ctk.CTkLabel(self, text="Vizualize Your Progress!", font=ctk.CTkFont(size=25, weight="bold"), text_color="#0C0C0C")
         self.label.grid(row=0, column=0, padx=10, pady=(10, 0), sticky='ew')
 
-        total_data = self.manager.over_time_tracker.get("Stats", None)
-        self.total_labels = ctk.CTkLabel(self, text=f"Total Number of Reps = {total_data['Total Rep #']}, Total Weight Lifted = {total_data['Total Volume']} lbs", font=ctk.CTkFont(size=20), text_color="#0C0C0C")
+        self.total_labels = ctk.CTkLabel(self, text="", font=ctk.CTkFont(size=20), text_color="#0C0C0C")
         self.total_labels.grid(row=0, column=1, padx=10, pady=(10, 0), sticky='ew')
+        self.update_totals()
 
 
         self.exercise = ctk.StringVar(value=None)
@@ -897,22 +1224,25 @@ class SeeStatesScreen(ctk.CTkFrame):
         label = ctk.CTkLabel(self.pick_exercise, text="Pick an exercise:", font=ctk.CTkFont(size=15), text_color="#0C0C0C")
         label.pack(padx=10, pady=10)
 
+        # which dates the graphs show
+        self.window = ctk.StringVar(value="All Dates")
+        self.window_menu = ctk.CTkOptionMenu(self.pick_exercise, values=list(self.WINDOWS), variable=self.window, command=self.choose_window,
+                                             fg_color="#298031", button_color="#1F6326", button_hover_color="#174D1D", text_color="#0C0C0C")
+        self.window_menu.pack(padx=10, pady=(0, 10))
+
         # this is to see the volume over time for all workouts
         self.exercise_option = ctk.CTkRadioButton(self.pick_exercise, text="Over Time Progress", text_color='orange', variable=self.exercise, value="Over Time Progress",
                                          command=lambda e="Over Time Progress": self.choose_exercise(e), font=ctk.CTkFont(size=20))
         self.exercise_option.pack(fill="x", padx=10, pady=(2, 20))
 
-        for exercise in self.manager.all_exercises:
-            self.exercise_option = ctk.CTkRadioButton(self.pick_exercise, text=exercise, variable=self.exercise, value=exercise,
-                                         command=lambda e=exercise: self.choose_exercise(e), font=ctk.CTkFont(size=20), text_color="#0C0C0C", fg_color="#298031", hover_color="#1F6326", border_color="#2C2C2C")
-            self.exercise_option.pack(fill="x", padx=10, pady=2)
+        self.add_exercise_buttons()
 
 
         self.scroll_frame = ctk.CTkScrollableFrame(self, border_width=2, fg_color="#3E505F", border_color="#000000")
         self.scroll_frame.grid(row=1, column=1, padx=10, pady=10, sticky="nsew")
         self.scroll_frame.grid_columnconfigure((0, 1), weight=1)  # make two columns
 
-        self.canvases = []  # Store canvas references for cleanup if needed
+        self.chart_slots = ChartSlots(self.scroll_frame)
 
         # Button to go back to the main screen
         self.back_button = ctk.CTkButton(self, corner_radius=0, fg_color="#FF1E1E", hover_color="#CB1919", text="Exit to Home Screen", command=lambda: self.go_back_to_main(), font=ctk.CTkFont(size=10), border_color="#000000", border_width=2, text_color="#0C0C0C")
@@ -922,13 +1252,59 @@ class SeeStatesScreen(ctk.CTkFrame):
         self.max_label.grid(row=2, column=1, padx=10, pady=(0, 10), sticky='ew')
 
 
-    def choose_exercise(self, e):
+    def data_changed(self, events):
+        """Called by the manager after changes, notes which parts of the screen are out of date."""
+        for event in events:
+            if isinstance(event, ExerciseAdded):
+                self.stale.add("exercises")
+            else:
+                self.stale.add("totals")
 
-        if self.canvases != []:
-            self.delete_graphs()  # Clean up any existing graphs
+
+    def update_totals(self):
+        total_data = self.manager.over_time_tracker.get("Stats", None)
+        self.total_labels.configure(text=f"Total Number of Reps = {total_data['Total Rep #']}, Total Weight Lifted = {total_data['Total Volume']} lbs")
+
+
+    def add_exercise_buttons(self):
+        """Makes a radio button for each exercise that doesn't have one yet, in order with the ones already there."""
+
+        # going backwards, each new button goes right before the button of the exercise after it
+        following = None
+        for exercise in reversed(self.manager.all_exercises):
+            button = self.exercise_buttons.get(exercise)
+            if button is None:
+                button = ctk.CTkRadioButton(self.pick_exercise, text=exercise, variable=self.exercise, value=exercise,
+                                            command=lambda e=exercise: self.choose_exercise(e), font=ctk.CTkFont(size=20), text_color="#0C0C0C", fg_color="#298031", hover_color="#1F6326", border_color="#2C2C2C")
+                if following is None:
+                    button.pack(fill="x", padx=10, pady=2)
+                else:
+                    button.pack(fill="x", padx=10, pady=2, before=following)
+                self.exercise_buttons[exercise] = button
+            following = button
+
+
+    def choose_exercise(self, e):
 
         self.show_exercise_data(e)
 
+
+    def choose_window(self, window):
+        if self.exercise.get():
+            self.show_exercise_data(self.exercise.get())
+
+
+    def window_days(self):
+        """The (first day, last day) the graphs are limited to, or None for every date."""
+        window = self.window.get()
+        if window == "This Block":
+            # the newest block, from the first of its workouts on
+            day_range = self.manager.training_blocks[-1].day_range() if self.manager.training_blocks else None
+            return (day_range[0], date.max.toordinal()) if day_range else None
+        if self.WINDOWS[window] is None:
+            return None
+        return (date.today().toordinal() - self.WINDOWS[window] + 1, date.max.toordinal())
+
     
     def show_exercise_data(self, exercise):
         # print(f"Showing stats for exercise: {exercise}")
@@ -936,9 +1312,90 @@ class SeeStatesScreen(ctk.CTkFrame):
         if exercise != "Over Time Progress":
             # display label for the max of the exercise
             max = self.manager.over_time_tracker['Personal Bests'][exercise]
-            self.max_label = ctk.CTkLabel(self, text=f"Your PB for {exercise} is {max[1]} lbs, completed for {max[0]} reps on {max[2]}!", font=ctk.CTkFont(size=20), text_color="#0C0C0C")
-            self.max_label.grid(row=2, column=1, padx=10, pady=(0, 10), sticky='ew')
+            text = f"Your PB for {exercise} is {max[1]} lbs, completed for {max[0]} reps on {max[2]}!"
+
+            # the rep max table: the best weight for each number of reps and the estimated 1 rep max
+            rep_maxes = self.manager.rep_max_index(exercise)
+            rows = rep_maxes.table(exercise)
+            if rows:
+                text += "\nRep maxes: " + "   ".join(f"{reps} x {weight} lbs" for reps, weight, _, _ in rows[:self.REP_MAX_COLUMNS])
+                e1rm, weight, reps, day = rep_maxes.e1rm(exercise)
+                text += f"\nEstimated 1 rep max: {e1rm:.0f} lbs (from {reps} x {whole_number(weight)} lbs on {format_date(day)})"
+            self.max_label.configure(text=text, font=ctk.CTkFont(size=20), text_color="#0C0C0C")
+        else:
+            # this will make the display dissapear if another exercise is choosen before this option
+            self.max_label.configure(text="")
+
+        span = self.window_days()
+        key = (exercise, self.manager.tracker_version, span)
+        charts = self.get_charts(exercise, span)
+        images = self.image_cache.setdefault(key, [None] * len(charts))
+
+        self.shown_key = key
+        self.chart_slots.show(charts)
 
+        # graphs drawn before are shown straight away, the rest are drawn in the background
+        for i, image in enumerate(images):
+            if image is not None:
+                self.chart_slots.set_image(i, image)
+        self.renderer.render(key, [(i, chart) for i, chart in enumerate(charts) if images[i] is None])
+        self.schedule_poll()
+
+
+    def schedule_poll(self):
+        if not self.poll_scheduled:
+            self.poll_scheduled = True
+            self.after(30, self.poll_renderer)
+
+
+    def poll_renderer(self):
+        """Puts the graphs finished by the background thread on screen, checking again shortly while some are still drawing."""
+
+        self.poll_scheduled = False
+        still_drawing = self.renderer.busy()  # checked first so nothing finishing during the loop below gets missed
+
+        for key, index, image in self.renderer.poll():
+            if key in self.image_cache:  # unless it was dropped from the cache while it was being drawn
+                self.image_cache[key][index] = image
+            if key == self.shown_key:
+                self.chart_slots.set_image(index, image)
+
+        if still_drawing:
+            self.schedule_poll()
+
+
+    def get_charts(self, exercise, span=None):
+        """Returns the charts for the exercise and dates, only preparing them again if the tracker changed since last time."""
+
+        key = (exercise, self.manager.tracker_version, span)
+        if key in self.render_cache:
+            self.render_cache.move_to_end(key)
+            if key in self.image_cache:
+                self.image_cache.move_to_end(key)
+            return self.render_cache[key]
+
+        # anything prepared for an older version of the tracker is out of date
+        for old_key in [k for k in self.render_cache if k[1] != self.manager.tracker_version]:
+            del self.render_cache[old_key]
+            self.image_cache.pop(old_key, None)
+
+        self.render_cache[key] = self.make_charts(exercise, span)
+        if len(self.render_cache) > self.CHART_CACHE_SIZE:
+            old_key, _ = self.render_cache.popitem(last=False)
+            self.image_cache.pop(old_key, None)
+        return self.render_cache[key]
+
+
+    def make_charts(self, exercise, span=None):
+        """Prepares the data, titles and labels of every chart for the exercise (or "Over Time Progress").
+        With a span (first day, last day) only those dates are charted, the series are in date order
+        so that part is cut out with a binary search without going through the rest."""
+        from chart_renderer import plot_days
+        from downsample import DetailLevels
+
+        charts = []
+
+        if exercise != "Over Time Progress":
 
             raw_exercise_data = self.manager.over_time_tracker.get(exercise, None)
 
@@ -957,76 +1414,40 @@ class SeeStatesScreen(ctk.CTkFrame):
 
 
             # this creates the number of graphs based on the different rep numbers found for the excersise
-            for i, rep_num in enumerate(exercise_data.keys()):  
-                
-                # Convert to datetime objects
-                dates = [datetime.strptime(date, "%B %d, %Y") for date in exercise_data[rep_num][1]]
-                weights = exercise_data[rep_num][0]
-
-                fig, ax = plt.subplots(figsize=(6, 4.1))
-                ax.plot(dates, weights, marker='o')
+            for rep_num, series in exercise_data.items():
+                if span is not None:
+                    series = series.between(*span)
 
+                # when weeks or months get combined into one point, volume is averaged and weights keep the heaviest
                 if rep_num == "Volume":
-                    ax.set_title(f"{exercise} Volume Progress", fontsize=14)
-                    ax.set_ylabel("Volume Per Workout (lbs)")
-                    ax.set_xlabel("Date")
+                    title = f"{exercise} Volume Progress"
+                    ylabel = "Volume Per Workout (lbs)"
+                    how = "mean"
                 else:
-                    ax.set_title(f"{exercise} Progress for {rep_num} Reps", fontsize=14)
-                    ax.set_ylabel("Weight (lbs)")
-                    ax.set_xlabel("Date")
-
-                # this formats the dates for the x-axis
-                ax.xaxis.set_major_formatter(mdates.DateFormatter("%b %d"))  # e.g., "Jun 23"
-                ax.xaxis.set_major_locator(mdates.AutoDateLocator())
-                ax.grid(True)  # Add grid for better readability
-                fig.autofmt_xdate()  # Auto-rotate date labels
-
-                canvas = FigureCanvasTkAgg(fig, master=self.scroll_frame)
-                canvas.draw()
-                
-                # Double-column logic
-                row = i // 2
-                col = i % 2
-                canvas.get_tk_widget().grid(row=row, column=col, padx=10, pady=10, sticky="nsew")
+                    title = f"{exercise} Progress for {rep_num} Reps"
+                    ylabel = "Weight (lbs)"
+                    how = "max"
 
-                self.canvases.append((canvas, fig))  # Store for later cleanup
+                # two charts per row, dates formatted like "Jun 23"
+                charts.append({"title": title, "ylabel": ylabel, "levels": DetailLevels(plot_days(series), series.values, how),
+                               "span": None, "date_format": "%b %d", "wide": False})
             
         else: # this is for plotting the over time total metrics (volume and rep numbers)
-            
-            # this will make the display dissapear if another exercise is choosen before this option
-            self.max_label = ctk.CTkLabel(self, text=f"")
-            self.max_label.grid(row=2, column=1, padx=10, pady=(0, 10), sticky='ew')
-
-            for i, metric in enumerate(['Volume Per Workout', 'Rep # Per Workout']):
-
-                stats = self.manager.over_time_tracker['Stats']
-                dates = [datetime.strptime(date, "%B %d, %Y") for date in stats[metric][1]]
-                volumes = stats[metric][0]
-
-                fig, ax = plt.subplots(figsize=(6, 4.1))
-                ax.plot(dates, volumes, marker='o')
-                ax.set_title(f"Total {metric} Over Time", fontsize=14)
-                ax.set_ylabel(f"{metric} (lbs)")
-                ax.set_xlabel("Date")
-                ax.grid(True)
 
-                # this formats the dates for the x-axis
-                ax.xaxis.set_major_formatter(mdates.DateFormatter("%b %d, %y"))  # e.g., "Jun 23"
-                ax.xaxis.set_major_locator(mdates.AutoDateLocator())
-                fig.autofmt_xdate()  # Auto-rotate date labels
+            stats = self.manager.over_time_tracker['Stats']
+            for metric in ['Volume Per Workout', 'Rep # Per Workout']:
+                series = stats[metric].between(*span) if span is not None else stats[metric]
+                charts.append({"title": f"Total {metric} Over Time", "ylabel": f"{metric} (lbs)",
+                               "levels": DetailLevels(plot_days(series), series.values, "mean"),
+                               "span": None, "date_format": "%b %d, %y", "wide": True})
 
-                canvas = FigureCanvasTkAgg(fig, master=self.scroll_frame)
-                canvas.draw()
-
-                canvas.get_tk_widget().grid(row=i, column=0, columnspan=2, padx=10, pady=10, sticky="nsew")
-                self.canvases.append((canvas, fig))
+        return charts
     
 
     def delete_graphs(self):
 
-        for canvas, fig in self.canvases:
-            canvas.get_tk_widget().destroy()
-            plt.close(fig)
+        self.shown_key = None
+        self.chart_slots.hide()
 
 
     def go_back_to_main(self):
@@ -1036,8 +1457,20 @@ class SeeStatesScreen(ctk.CTkFrame):
 
     
     def reset(self):
+        """Called every time the screen is shown. The first time it makes the widgets, after
+        that it only updates what changed since the last visit and starts with nothing picked."""
 
-        self.initialize_setup()
+        if not self.built:
+            self.initialize_setup()
+            self.built = True
+        else:
+            if "exercises" in self.stale:
+                self.add_exercise_buttons()
+            if "totals" in self.stale:
+                self.update_totals()
+            self.exercise.set("")
+            self.max_label.configure(text="")
+        self.stale.clear()
 
 
 
@@ -1052,14 +1485,127 @@ class SeeStatesScreen(ctk.CTkFrame):
 
 
 
+class PagedWorkoutText():
+    """Shows a list of workouts in a textbox a page at a time instead of all at once.
+
+    Only a few pages around where the user is looking are ever in the textbox. Scrolling near the
+    bottom adds the next page (and drops the first one once there are MAX_PAGES), scrolling near
+    the top brings back the page before, so a block with thousands of workouts opens as fast as
+    one with ten. The view is moved along with the text so the page doesn't jump while scrolling."""
+
+    PAGE_SIZE = 20  # workouts per page
+    MAX_PAGES = 4   # pages kept in the textbox at once
+    EDGE = 0.1      # how close to the top or bottom (as a part of the text) loads the next page
+
+    def __init__(self, textbox, text_of):
+        self.textbox = textbox
+        self.text_of = text_of  # gives the text of one workout
+        self.workouts = []
+        self.first_page = 0     # the page at the top of the textbox
+        self.page_lines = []    # the number of lines of each page in the textbox
+        self.check_scheduled = False
+
+        # keep the scrollbar working and find out about every scroll, whether by wheel, keys or the scrollbar
+        self.scrollbar_update = textbox.cget("yscrollcommand")
+        textbox.configure(yscrollcommand=self.on_scroll)
+
+
+    def show(self, workouts):
+        self.workouts = workouts
+        self.first_page = 0
+        self.page_lines = []
+        self.textbox.delete("1.0", "end")
+        self.add_page_below()
+        self.textbox.yview_moveto(0)
+
+
+    def page_text(self, page):
+        start = page * self.PAGE_SIZE
+        return "".join(self.text_of(workout) for workout in self.workouts[start:start + self.PAGE_SIZE])
+
+
+    def page_count(self):
+        return -(-len(self.workouts) // self.PAGE_SIZE)
+
+
+    def on_scroll(self, first, last):
+        self.textbox.tk.call(self.scrollbar_update, first, last)
+        # changing the text below calls this again, so the check waits until things settle
+        if not self.check_scheduled:
+            self.check_scheduled = True
+            self.textbox.after_idle(self.load_more)
+
+
+    def load_more(self):
+        self.check_scheduled = False
+        first, last = self.textbox.yview()
+        last_page = self.first_page + len(self.page_lines) - 1
+
+        if last > 1 - self.EDGE and last_page + 1 < self.page_count():
+            self.add_page_below()
+            if len(self.page_lines) > self.MAX_PAGES:
+                self.drop_page_above()
+        elif first < self.EDGE and self.first_page > 0:
+            self.add_page_above()
+            if len(self.page_lines) > self.MAX_PAGES:
+                self.drop_page_below()
+
+
+    def top_line(self):
+        return int(self.textbox.index("@0,0").split(".")[0])
+
+
+    def add_page_below(self):
+        text = self.page_text(self.first_page + len(self.page_lines))
+        self.textbox.insert("end", text)
+        self.page_lines.append(text.count("\n"))
+
+
+    def add_page_above(self):
+        top = self.top_line()
+        self.first_page -= 1
+        text = self.page_text(self.first_page)
+        self.textbox.insert("1.0", text)
+        self.page_lines.insert(0, text.count("\n"))
+        self.textbox.yview(f"{top + self.page_lines[0]}.0")
+
+
+    def drop_page_above(self):
+        top = self.top_line()
+        lines = self.page_lines.pop(0)
+        self.textbox.delete("1.0", f"{lines + 1}.0")
+        self.first_page += 1
+        self.textbox.yview(f"{max(top - lines, 1)}.0")
+
+
+    def drop_page_below(self):
+        lines = self.page_lines.pop()
+        self.textbox.delete(f"{sum(self.page_lines) + 1}.0", "end")
+
+
+
+
 class PastWorkoutsScreen(ctk.CTkFrame):
     """This will allow users to view past workouts that were submitted in their different training blocks."""
 
+    TEXT_CACHE_SIZE = 2 * PagedWorkoutText.MAX_PAGES * PagedWorkoutText.PAGE_SIZE  # workouts
+
     def __init__(self, parent, controller, manager):
         super().__init__(parent, fg_color="#474747")
         self.controller = controller
         self.manager = manager
 
+        # the formatted text of the workouts shown last, {id(workout): (workout, text)}, least recently
+        # used first. A few textboxes' worth, so scrolling back and forth doesn't format them again
+        self.text_cache = OrderedDict()
+
+        # like the stats screen, the widgets are made once and the block buttons are only
+        # made again when blocks were added or removed since the last visit
+        self.built = False
+        self.stale = set()
+        self.block_buttons = []  # [(block, its radio button)] in the order of manager.training_blocks
+        manager.events.subscribe(self.data_changed, BlockCreated, BlockRemoved, batched=True)
+
     def initialize_setup(self):
 
         self.block = ctk.StringVar(value=None)
@@ -1081,16 +1627,15 @@ class PastWorkoutsScreen(ctk.CTkFrame):
         label = ctk.CTkLabel(self.pick_block, text="Pick a Training Block:", font=ctk.CTkFont(size=19), text_color="#0C0C0C")
         label.pack(padx=10, pady=10)
 
-        for block in self.manager.training_blocks:
-            self.block_option = ctk.CTkRadioButton(self.pick_block, text=block.starting_date, variable=self.block, value=block,
-                                         command=lambda b=block: self.choose_block(b), font=ctk.CTkFont(size=30), text_color="#0C0C0C")
-            self.block_option.pack(fill="x", padx=10, pady=2)
+        self.update_block_buttons()
 
 
         # this is going to be the text box that the user can see all the past workouts from
         # the training block they chose
         self.words = ctk.CTkTextbox(self, wrap="word", font=ctk.CTkFont(size=25), text_color="#0C0C0C", border_width=2, fg_color="#90938F", border_color="#000000")
         self.words.grid(row=1, column=1, rowspan=2, padx=10, pady=10, sticky="nsew")
+        # only the part of the block being looked at is put in the text box, see PagedWorkoutText
+        self.workout_view = PagedWorkoutText(self.words, self.workout_text)
 
 
         # Button to go back to the main screen
@@ -1098,17 +1643,52 @@ class PastWorkoutsScreen(ctk.CTkFrame):
         self.back_button.grid(row=2, column=0, padx=10, pady=(0, 10))
 
 
+    def data_changed(self, events):
+        self.stale.add("blocks")
+
+
+    def update_block_buttons(self):
+        """Keeps the buttons of the blocks that are still there and makes buttons for the rest."""
+        blocks = self.manager.training_blocks
+        kept = 0
+        while kept < len(self.block_buttons) and kept < len(blocks) and self.block_buttons[kept][0] is blocks[kept]:
+            kept += 1
+
+        for _, button in self.block_buttons[kept:]:
+            button.destroy()
+        del self.block_buttons[kept:]
+
+        for block in blocks[kept:]:
+            self.block_option = ctk.CTkRadioButton(self.pick_block, text=block.starting_date, variable=self.block, value=block,
+                                         command=lambda b=block: self.choose_block(b), font=ctk.CTkFont(size=30), text_color="#0C0C0C")
+            self.block_option.pack(fill="x", padx=10, pady=2)
+            self.block_buttons.append((block, self.block_option))
+
+
     def choose_block(self, b):
         self.display_workouts(b)
 
     
     def display_workouts(self, block):
-        self.words.delete("1.0", "end")
+        # fill the text box with the exercises, the first page now and the rest as the user scrolls
+        self.workout_view.show(block.workouts)
+
+
+    def workout_text(self, workout):
+        """The formatted text of a workout, only formatted again once it's dropped from the cache."""
+        # workouts don't change once they're logged. The workout is kept with its text so a
+        # new workout that happens to get the id of a deleted one isn't given the wrong text
+        cached = self.text_cache.get(id(workout))
+        if cached is not None and cached[0] is workout:
+            self.text_cache.move_to_end(id(workout))
+            return cached[1]
+
+        cached = self.text_cache[id(workout)] = (workout, self.format_workout_table(workout) + "\n")
+        self.text_cache.move_to_end(id(workout))
+        if len(self.text_cache) > self.TEXT_CACHE_SIZE:
+            self.text_cache.popitem(last=False)
+        return cached[1]
 
-        # fill the text box with the exercises:
-        for workout in block.workouts:
-            self.words.insert("end", self.format_workout_table(workout) + "\n")
-        
 
     def format_workout_table(self, workout):
         lines = [f"{workout.date} — Workout: {workout.template_name}\n"]
@@ -1124,15 +1704,23 @@ class PastWorkoutsScreen(ctk.CTkFrame):
         return "\n".join(lines)
 
     def clear_content(self):
-        self.words.delete("1.0", "end")
+        self.workout_view.show([])
 
     def go_back_to_main(self):
         self.clear_content()
         self.controller.show_frame(HomeScreen)
 
     def reset(self):
-
-        self.initialize_setup()
+        # the widgets are made the first time, after that only the block list is brought up to date
+        if not self.built:
+            self.initialize_setup()
+            self.built = True
+        else:
+            if "blocks" in self.stale:
+                self.update_block_buttons()
+            self.block.set("")
+            self.clear_content()
+        self.stale.clear()
 
 
 
@@ -1167,15 +1755,11 @@ class AllExercisesScreen(ctk.CTkFrame):
         self.label = ctk.CTkLabel(self, text="All Exercises", font=ctk.CTkFont(size=40), text_color="#0C0C0C")
         self.label.grid(row=0, column=1, pady=20, sticky="n")
 
-        # Create a scrollable frame to display all exercises
-        self.exercise_scrollframe = ctk.CTkScrollableFrame(self, border_width=2, fg_color="#3E505F", border_color="#000000")
+        # Create a searchable list to display all exercises
+        self.exercise_scrollframe = ExerciseList(self, self.manager.exercise_index, self.make_exercise_label, self.fill_exercise_label, row_height=40, font_size=25,
+                                                 border_width=2, fg_color="#3E505F", border_color="#000000")
         self.exercise_scrollframe.grid(row=0, column=0, rowspan=3, padx=10, pady=(10, 10), sticky="nsew")
 
-        # Populate the scrollable frame with checkboxes for each exercise
-        for exercise in self.manager.all_exercises:  # Load exercises from the manager
-            label = ctk.CTkLabel(self.exercise_scrollframe, text=f"- {exercise}", anchor="w", font=ctk.CTkFont(size=25), text_color="#0C0C0C")
-            label.grid(sticky="w", padx=10, pady=2)
-
         # self.box = ctk.CTkComboBox(self, font=ctk.CTkFont(size=25), fg_color="#90938F", text_color="#0C0C0C", border_color="#000000")
         # self.box.grid(row=1, rowspan=3, column=1, padx=10, pady=(10, 10), sticky="ew")
 
@@ -1212,16 +1796,17 @@ class AllExercisesScreen(ctk.CTkFrame):
             self.manager.add_exercise(new_exercise)
             # Clear the entry field
             self.new_exercise_entry.delete(0, 'end')
-            self.manager.save_data()
             # print(f"Exercise '{new_exercise}' added.")
 
-
-            for widget in self.exercise_scrollframe.winfo_children():
-                widget.destroy()
-
-            for exercise in self.manager.all_exercises:  # Load exercises from the manager
-                label = ctk.CTkLabel(self.exercise_scrollframe, text=f"- {exercise}", anchor="w", font=ctk.CTkFont(size=25), text_color="#0C0C0C")
-                label.grid(sticky="w", padx=10, pady=2)
+            # show the list again with the new exercise in it
+            self.exercise_scrollframe.refresh()
 
         else:
             print("Exercise already exists or is empty.")
+
+
+    def make_exercise_label(self, master):
+        return ctk.CTkLabel(master, anchor="w", font=ctk.CTkFont(size=25), text_color="#0C0C0C")
+
+    def fill_exercise_label(self, label, exercise):
+        label.configure(text=f"- {exercise}")